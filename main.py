@@ -64,7 +64,7 @@ class StockScreener:
             api_key=data_source_config.get('api_key') or None
         )
         self.data_storage = DataStorage()
-        self.indicators = TechnicalIndicators()
+        self.indicators = TechnicalIndicators(warmup=True)
         self.reporter = Reporter(
             output_dir=self.config_manager.get('report.output_dir', 'reports')
         )
@@ -237,10 +237,9 @@ class StockScreener:
         # 2. 计算技术指标
         self.logger.info("计算技术指标...")
         indicators_config = self.config_manager.get_indicators_config()
-        for ticker in stock_data.keys():
-            stock_data[ticker] = self.indicators.add_all_indicators(
-                stock_data[ticker], indicators_config
-            )
+        stock_data = self.indicators.add_all_indicators_batch(
+            stock_data, indicators_config, inplace=True
+        )
         
         # 3. 硬过滤
         self.logger.info("执行硬过滤...")
@@ -276,16 +275,12 @@ class StockScreener:
         
         # 4. 趋势评分
         self.logger.info("计算趋势得分...")
-        trend_scores = {}
-        for ticker, df in stock_data.items():
-            trend_scores[ticker] = self.trend_scorer.score(df)
+        trend_scores = self.trend_scorer.score_batch(stock_data)
         
         # 5. 流动性评分
         self.logger.info("计算流动性得分...")
-        liquidity_scores = {}
         liq_config = self.config_manager.get('screening', {}).get('filters', {}).get('liquidity', {})
-        for ticker, df in stock_data.items():
-            liquidity_scores[ticker] = self.scoring_engine.calculate_liquidity_score(df, liq_config)
+        liquidity_scores = self.scoring_engine.calculate_liquidity_scores(stock_data, liq_config)
         
         # 6. 执行策略（获取信号）
         self.logger.info("执行策略筛选...")
@@ -111,6 +111,41 @@ class DataFetcher:
         """
         return self.fetcher.fetch_multiple_stocks(tickers, period, start_date, end_date, batch_size)
     
+    def aiter_stocks(self, tickers: List[str], period: str = 'daily',
+                     start_date: Optional[datetime] = None,
+                     end_date: Optional[datetime] = None,
+                     max_rate: Optional[int] = None,
+                     time_period: float = 60.0):
+        """
+        异步逐只获取多个股票的数据，按完成顺序产出 (ticker, dataframe)，失败时dataframe为None
+        
+        参数同 afetch_multiple_stocks；用法: async for ticker, df in fetcher.aiter_stocks(tickers): ...
+        """
+        return self.fetcher.aiter_stocks(tickers, period, start_date, end_date, max_rate, time_period)
+    
+    async def afetch_multiple_stocks(self, tickers: List[str], period: str = 'daily',
+                                     start_date: Optional[datetime] = None,
+                                     end_date: Optional[datetime] = None,
+                                     max_rate: Optional[int] = None,
+                                     time_period: float = 60.0) -> Dict[str, pd.DataFrame]:
+        """
+        异步获取多个股票的数据（按限速器控制请求频率）
+        
+        Args:
+            tickers: 股票代码列表
+            period: 时间周期
+            start_date: 开始日期
+            end_date: 结束日期
+            max_rate: time_period 秒内最多请求次数（默认按 request_delay 换算）
+            time_period: 限速时间窗口（秒）
+        
+        Returns:
+            Dict[str, pd.DataFrame]: 股票代码到DataFrame的映射
+        """
+        return await self.fetcher.afetch_multiple_stocks(
+            tickers, period, start_date, end_date, max_rate, time_period
+        )
+    
     def fetch_all_timeframes(self, tickers: List[str]) -> Dict[str, Dict[str, pd.DataFrame]]:
         """
         获取所有时间周期的数据
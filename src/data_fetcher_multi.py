@@ -3,9 +3,10 @@ Multi-Source Data Fetcher - 多数据源数据采集模块
 支持 yfinance, Alpha Vantage, Polygon.io 等多个数据源
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 import pandas as pd
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
@@ -13,6 +14,59 @@ from abc import ABC, abstractmethod
 
 from .utils import get_sp500_tickers, get_nasdaq100_tickers, calculate_date_range
 
+# Alpha Vantage 批量报价接口每次请求最多的股票数
+BULK_QUOTES_BATCH_SIZE = 100
+
+# orjson 可选：解析大体积JSON响应更快，未安装时使用 response.json()
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class AsyncRateLimiter:
+    """
+    异步漏桶限速器：任意 time_period 秒内最多放行 max_rate 次请求
+    
+    桶未满时请求立即放行（允许突发到 max_rate 次），之后按 max_rate/time_period 的速率放行，
+    只在确实超限时等待，不做固定间隔的悲观sleep。只能在单个事件循环内使用。
+    """
+    
+    def __init__(self, max_rate: int, time_period: float = 60.0):
+        """
+        Args:
+            max_rate: 时间窗口内最多请求次数
+            time_period: 时间窗口（秒）
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._leak_rate = max_rate / time_period
+        self._level = 0.0
+        self._last_check = None
+    
+    def _leak(self):
+        """按流逝的时间排空桶"""
+        now = time.monotonic()
+        if self._last_check is not None:
+            self._level = max(0.0, self._level - (now - self._last_check) * self._leak_rate)
+        self._last_check = now
+    
+    async def acquire(self):
+        """等待直到可以发出一次请求"""
+        while True:
+            self._leak()
+            if self._level + 1 <= self.max_rate:
+                self._level += 1
+                return
+            await asyncio.sleep((self._level + 1 - self.max_rate) / self._leak_rate)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
 
 class DataSourceBase(ABC):
     """数据源基类"""
@@ -22,12 +76,52 @@ class DataSourceBase(ABC):
         self.max_retries = max_retries
         self.logger = logging.getLogger(self.__class__.__name__)
     
+    @staticmethod
+    def _create_session(requests_module):
+        """
+        创建带连接池的HTTP会话，同一数据源的所有请求复用keep-alive连接
+        
+        服务器端错误(5xx)由连接池自动重试；限流(429)仍交给 _retry_fetch 按 request_delay 退避。
+        
+        Args:
+            requests_module: requests模块
+        
+        Returns:
+            requests.Session: HTTP会话
+        """
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests_module.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+        )
+        session.mount('https://', adapter)
+        return session
+    
     @abstractmethod
     def fetch_stock_data(self, ticker: str, start_date: datetime, 
                         end_date: datetime, interval: str = '1d') -> Optional[pd.DataFrame]:
         """获取股票数据的抽象方法"""
         pass
     
+    @staticmethod
+    def _parse_json(response):
+        """
+        解析HTTP响应中的JSON
+        
+        Args:
+            response: requests响应
+        
+        Returns:
+            解析后的JSON对象
+        """
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+    
     def _retry_fetch(self, ticker: str, start_date: datetime, 
                     end_date: datetime, interval: str, retry_count: int = 0) -> Optional[pd.DataFrame]:
         """带重试的获取数据"""
@@ -107,6 +201,7 @@ class AlphaVantageSource(DataSourceBase):
         try:
             import requests
             self.requests = requests
+            self.session = self._create_session(requests)
             self.logger.info(f"Alpha Vantage 数据源已初始化 (延迟: {request_delay}秒)")
         except ImportError:
             raise ImportError("请安装 requests: pip install requests")
@@ -138,10 +233,10 @@ class AlphaVantageSource(DataSourceBase):
             'datatype': 'json'
         }
         
-        response = self.requests.get(url, params=params, timeout=30)
+        response = self.session.get(url, params=params, timeout=30)
         response.raise_for_status()
         
-        data = response.json()
+        data = self._parse_json(response)
         
         # 检查错误
         if 'Error Message' in data:
@@ -173,7 +268,7 @@ class AlphaVantageSource(DataSourceBase):
         
         # 转换为DataFrame
         df = pd.DataFrame.from_dict(time_series, orient='index')
-        df.index = pd.to_datetime(df.index)
+        df.index = pd.to_datetime(df.index, format='%Y-%m-%d')
         df = df.sort_index()
         
         # 标准化列名 - Alpha Vantage的列名格式是 "1. open", "2. high" 等
@@ -194,8 +289,8 @@ class AlphaVantageSource(DataSourceBase):
         df.rename(columns=column_mapping, inplace=True)
         df = df.astype(float)
         
-        # 筛选日期范围
-        df = df[(df.index >= start_date) & (df.index <= end_date)]
+        # 筛选日期范围（索引已排序，按标签切片）
+        df = df.loc[start_date:end_date]
         
         if df.empty:
             return None
@@ -206,6 +301,56 @@ class AlphaVantageSource(DataSourceBase):
         df['ticker'] = ticker
         
         return df
+    
+    def fetch_latest_batch(self, tickers: List[str]) -> Optional[pd.DataFrame]:
+        """
+        通过批量报价接口获取多只股票的最新报价（每次请求最多100只）
+        
+        只需要最新价格时，一次请求代替逐只请求日线数据，大幅节省限流额度。
+        该接口（REALTIME_BULK_QUOTES）需要Alpha Vantage高级版API key。
+        
+        Args:
+            tickers: 股票代码列表
+        
+        Returns:
+            pd.DataFrame: 每只股票一行，包含 ticker/timestamp/open/high/low/close/volume 等列，
+                失败时返回None
+        """
+        url = 'https://www.alphavantage.co/query'
+        rows = []
+        
+        for batch_idx in range(0, len(tickers), BULK_QUOTES_BATCH_SIZE):
+            batch = tickers[batch_idx:batch_idx + BULK_QUOTES_BATCH_SIZE]
+            params = {
+                'function': 'REALTIME_BULK_QUOTES',
+                'symbol': ','.join(batch),
+                'apikey': self.api_key,
+                'datatype': 'json'
+            }
+            
+            response = self.session.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            data = self._parse_json(response)
+            
+            if 'data' not in data:
+                # 免费版key或限流时只返回提示信息
+                message = data.get('Note') or data.get('Information') or data.get('message') or data
+                self.logger.error(f"批量报价请求失败: {message}")
+                return None
+            
+            rows.extend(data['data'])
+            
+            if batch_idx + BULK_QUOTES_BATCH_SIZE < len(tickers):
+                time.sleep(self.request_delay)
+        
+        if not rows:
+            return None
+        
+        df = pd.DataFrame(rows).rename(columns={'symbol': 'ticker'})
+        numeric_cols = [c for c in df.columns if c not in ('ticker', 'timestamp', 'extended_hours_quote')]
+        df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
+        
+        return df
 
 
 class PolygonSource(DataSourceBase):
@@ -225,6 +370,7 @@ class PolygonSource(DataSourceBase):
         try:
             import requests
             self.requests = requests
+            self.session = self._create_session(requests)
             self.logger.info(f"Polygon 数据源已初始化 (延迟: {request_delay}秒)")
         except ImportError:
             raise ImportError("请安装 requests: pip install requests")
@@ -249,10 +395,10 @@ class PolygonSource(DataSourceBase):
             'apiKey': self.api_key
         }
         
-        response = self.requests.get(url, params=params, timeout=30)
+        response = self.session.get(url, params=params, timeout=30)
         response.raise_for_status()
         
-        data = response.json()
+        data = self._parse_json(response)
         
         # 检查错误
         if data.get('status') == 'ERROR':
@@ -426,6 +572,92 @@ class MultiSourceDataFetcher:
         
         return results
     
+    async def aiter_stocks(self, tickers: List[str], period: str = 'daily',
+                           start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None,
+                           max_rate: Optional[int] = None,
+                           time_period: float = 60.0) -> AsyncIterator[Tuple[str, Optional[pd.DataFrame]]]:
+        """
+        异步获取多个股票的数据，按完成顺序逐只产出（限速器控制请求频率，信号量控制并发数）
+        
+        数据源接口是同步的，每只股票在线程中获取；请求频率由限速器精确控制，
+        不再在每次请求后固定sleep。调用方可以边获取边处理（如直接保存），无需持有全部数据。
+        
+        Args:
+            tickers: 股票代码列表
+            period: 时间周期
+            start_date: 开始日期
+            end_date: 结束日期
+            max_rate: time_period 秒内最多请求次数（默认按 request_delay 换算，如12秒对应每分钟5次）
+            time_period: 限速时间窗口（秒）
+        
+        Yields:
+            tuple: (股票代码, DataFrame)，获取失败时DataFrame为None
+        """
+        if max_rate is None:
+            request_delay = self.data_source.request_delay
+            max_rate = max(1, int(time_period / request_delay)) if request_delay > 0 else len(tickers) or 1
+        limiter = AsyncRateLimiter(max_rate, time_period)
+        semaphore = asyncio.Semaphore(max(1, self.max_workers))
+        
+        self.logger.info(
+            f"开始异步获取 {len(tickers)} 只股票的 {period} 数据"
+            f"（每{time_period:.0f}秒最多{max_rate}次请求，并发{max(1, self.max_workers)}）"
+        )
+        
+        done = 0
+        
+        async def fetch_one(ticker: str) -> Tuple[str, Optional[pd.DataFrame]]:
+            nonlocal done
+            async with semaphore:
+                async with limiter:
+                    df = await asyncio.to_thread(self.fetch_single_stock, ticker, period, start_date, end_date)
+            done += 1
+            if df is not None and not df.empty:
+                self.logger.info(f"✓ {ticker} ({done}/{len(tickers)})")
+                return ticker, df
+            self.logger.warning(f"✗ {ticker} 失败")
+            return ticker, None
+        
+        tasks = [asyncio.ensure_future(fetch_one(ticker)) for ticker in tickers]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # 调用方提前停止迭代时取消尚未完成的请求
+            for task in tasks:
+                task.cancel()
+    
+    async def afetch_multiple_stocks(self, tickers: List[str], period: str = 'daily',
+                                     start_date: Optional[datetime] = None,
+                                     end_date: Optional[datetime] = None,
+                                     max_rate: Optional[int] = None,
+                                     time_period: float = 60.0) -> Dict[str, pd.DataFrame]:
+        """
+        异步获取多个股票的数据（参数同 aiter_stocks）
+        
+        Returns:
+            Dict[str, pd.DataFrame]: 股票代码到DataFrame的映射（按输入顺序）
+        """
+        frames = {}
+        async for ticker, df in self.aiter_stocks(tickers, period, start_date, end_date, max_rate, time_period):
+            if df is not None:
+                frames[ticker] = df
+        
+        results = {ticker: frames[ticker] for ticker in tickers if ticker in frames}
+        failed_tickers = [ticker for ticker in tickers if ticker not in frames]
+        
+        self.logger.info(
+            f"数据获取完成: 成功 {len(results)}/{len(tickers)}, 失败 {len(failed_tickers)}"
+        )
+        
+        if failed_tickers:
+            self.logger.warning(f"失败的股票: {', '.join(failed_tickers[:10])}" + 
+                              (f" ... (还有 {len(failed_tickers)-10} 只)" 
+                               if len(failed_tickers) > 10 else ""))
+        
+        return results
+    
     def fetch_all_timeframes(self, tickers: List[str]) -> Dict[str, Dict[str, pd.DataFrame]]:
         """获取所有时间周期的数据"""
         self.logger.info("开始获取多周期数据（日K、周K、月K）")
@@ -10,6 +10,15 @@ from typing import Dict, Optional, List
 import pandas as pd
 from pathlib import Path
 
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# 读取CSV使用的解析引擎：安装了pyarrow时用其多线程解析器，否则用pandas默认的C解析器
+CSV_ENGINE = 'pyarrow' if PYARROW_AVAILABLE else 'c'
+
 
 class DataStorage:
     """数据存储管理器"""
@@ -49,6 +58,19 @@ class DataStorage:
         }
         return period_map.get(period, self.daily_dir)
     
+    def get_file_path(self, ticker: str, period: str = 'daily') -> Path:
+        """
+        获取单个股票数据文件的路径
+        
+        Args:
+            ticker: 股票代码
+            period: 时间周期
+        
+        Returns:
+            Path: CSV文件路径
+        """
+        return self.get_directory(period) / f"{ticker}.csv"
+    
     def save_stock_data(self, ticker: str, df: pd.DataFrame, period: str = 'daily'):
         """
         保存单个股票的数据
@@ -63,8 +85,7 @@ class DataStorage:
             return
         
         try:
-            directory = self.get_directory(period)
-            file_path = directory / f"{ticker}.csv"
+            file_path = self.get_file_path(ticker, period)
             
             # 保存到CSV
             df.to_csv(file_path, index=False)
@@ -102,17 +123,16 @@ class DataStorage:
             pd.DataFrame: 数据DataFrame，如果不存在返回None
         """
         try:
-            directory = self.get_directory(period)
-            file_path = directory / f"{ticker}.csv"
+            file_path = self.get_file_path(ticker, period)
             
             if not file_path.exists():
                 self.logger.debug(f"文件不存在: {file_path}")
                 return None
             
-            df = pd.read_csv(file_path)
+            df = pd.read_csv(file_path, engine=CSV_ENGINE)
             
-            # 确保日期列为datetime类型
-            if 'date' in df.columns:
+            # 确保日期列为datetime类型（pyarrow引擎通常已解析好日期）
+            if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
                 df['date'] = pd.to_datetime(df['date'])
             
             self.logger.debug(f"已加载 {ticker} 的 {period} 数据，共 {len(df)} 条")
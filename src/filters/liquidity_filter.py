@@ -49,7 +49,7 @@ class LiquidityFilter(BaseFilter):
                     continue
                 
                 # 检查最新价格
-                latest_price = df.iloc[-1]['close']
+                latest_price = df['close'].to_numpy()[-1]
                 if latest_price < self.min_price:
                     rejected[ticker] = f"价格过低 ${latest_price:.2f} < ${self.min_price}"
                     continue
@@ -5,6 +5,7 @@ TrendFilter - 趋势硬门槛过滤器
 
 import logging
 from typing import Dict, Tuple
+import numpy as np
 import pandas as pd
 
 from .base_filter import BaseFilter
@@ -42,18 +43,31 @@ class TrendFilter(BaseFilter):
         passed = {}
         rejected = {}
         
+        # 需要读取的列只取决于配置，循环外确定一次
+        needed = ['close']
+        if self.require_above_ma50:
+            needed.append('sma_50')
+        if self.require_ma20_uptrend:
+            needed.append('sma_20')
+        
         for ticker, df in data.items():
             try:
                 if df is None or len(df) < 50:
                     rejected[ticker] = "数据不足（需要至少50天）"
                     continue
                 
-                latest = df.iloc[-1]
-                current_price = latest['close']
+                # 一次性取出所需列，避免逐列 `in df.columns` + df[col] 查找
+                columns = [c for c in needed if c in df.columns]
+                values = df[columns].to_numpy(dtype=np.float64)
+                col_idx = {c: i for i, c in enumerate(columns)}
+                latest = values[-1]
+                
+                close_idx = col_idx['close']
+                current_price = latest[close_idx]
                 
                 # 检查20日回报率
                 if len(df) >= 20:
-                    price_20d_ago = df.iloc[-20]['close']
+                    price_20d_ago = values[-20, close_idx]
                     return_20d = (current_price - price_20d_ago) / price_20d_ago
                     
                     if return_20d < self.min_20d_return:
@@ -62,31 +76,31 @@ class TrendFilter(BaseFilter):
                 
                 # 检查是否在MA50上方
                 if self.require_above_ma50:
-                    if 'sma_50' not in df.columns:
+                    if 'sma_50' not in col_idx:
                         rejected[ticker] = "缺少MA50数据"
                         continue
                     
-                    ma50 = latest['sma_50']
-                    if pd.isna(ma50) or current_price <= ma50:
+                    ma50 = latest[col_idx['sma_50']]
+                    if np.isnan(ma50) or current_price <= ma50:
                         rejected[ticker] = f"价格在MA50下方 ${current_price:.2f} <= ${ma50:.2f}"
                         continue
                 
                 # 检查MA20是否上升
                 if self.require_ma20_uptrend:
-                    if 'sma_20' not in df.columns:
+                    if 'sma_20' not in col_idx:
                         rejected[ticker] = "缺少MA20数据"
                         continue
                     
                     # 计算MA20的斜率（最近5天）
                     if len(df) >= 25:
-                        recent_ma20 = df['sma_20'].tail(5)
-                        if recent_ma20.isna().any():
+                        recent_ma20 = values[-5:, col_idx['sma_20']]
+                        if np.isnan(recent_ma20).any():
                             rejected[ticker] = "MA20数据不完整"
                             continue
                         
                         # 简单斜率：最新值 vs 5天前值
-                        ma20_now = recent_ma20.iloc[-1]
-                        ma20_5d_ago = recent_ma20.iloc[0]
+                        ma20_now = recent_ma20[-1]
+                        ma20_5d_ago = recent_ma20[0]
                         ma20_slope = (ma20_now - ma20_5d_ago) / ma20_5d_ago
                         
                         if ma20_slope <= 0:
@@ -3,14 +3,41 @@ WeeklyTrendFilter - 周趋势确认过滤器
 多时间框架验证，确保日线信号与周线趋势一致
 """
 
+import os
 import logging
+import weakref
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 from .base_filter import BaseFilter
 
 
+# 单只股票的过滤结果编码，用于批量统计
+_OUTCOME_UNKNOWN = 0     # 周线数据缺失
+_OUTCOME_ALIGNED = 1     # 日/周趋势一致
+_OUTCOME_SIDEWAYS = 2    # 有一方横盘
+_OUTCOME_CONFLICT = 3    # 日/周趋势冲突
+_OUTCOME_ERROR = 4       # 分析出错（优雅降级放行，不计入统计）
+_NUM_OUTCOMES = 5
+
+
+@lru_cache(maxsize=8192)
+def _load_weekly_cached(storage_ref: weakref.ref, ticker: str, mtime: float) -> Optional[pd.DataFrame]:
+    """
+    加载周线数据（模块级缓存，多个过滤器实例共享）
+    
+    缓存键包含文件修改时间，磁盘文件更新后自动失效；
+    存储实例以弱引用参与缓存键，不会阻止其被回收
+    """
+    storage = storage_ref()
+    if storage is None:
+        return None
+    return storage.load_stock_data(ticker, 'weekly')
+
+
 @dataclass
 class WeeklyTrendState:
     """周线趋势状态"""
@@ -49,23 +76,23 @@ class WeeklyTrendFilter(BaseFilter):
         self.require_alignment = config.get('require_alignment', True)
         self.sideways_threshold = config.get('sideways_threshold', 0.005)
         self.data_storage = data_storage
-        
-        # 缓存周线数据
-        self._weekly_data_cache: Dict[str, pd.DataFrame] = {}
     
     def _load_weekly_data(self, ticker: str) -> Optional[pd.DataFrame]:
-        """加载周线数据"""
-        if ticker in self._weekly_data_cache:
-            return self._weekly_data_cache[ticker]
-        
+        """加载周线数据（按文件修改时间缓存）"""
         if self.data_storage is None:
             self.logger.warning(f"未配置DataStorage，无法加载 {ticker} 周线数据")
             return None
         
         try:
-            weekly_df = self.data_storage.load_stock_data(ticker, 'weekly')
+            file_path = self.data_storage.get_file_path(ticker, 'weekly')
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            self.logger.debug(f"{ticker} 周线数据文件不存在")
+            return None
+        
+        try:
+            weekly_df = _load_weekly_cached(weakref.ref(self.data_storage), ticker, mtime)
             if weekly_df is not None and not weekly_df.empty:
-                self._weekly_data_cache[ticker] = weekly_df
                 return weekly_df
         except Exception as e:
             self.logger.debug(f"加载 {ticker} 周线数据失败: {e}")
@@ -79,22 +106,20 @@ class WeeklyTrendFilter(BaseFilter):
         Returns:
             tuple: (ma_value, slope, trend)
         """
-        if weekly_df is None or len(weekly_df) < self.weekly_ma_period + self.slope_lookback_weeks:
+        period = self.weekly_ma_period
+        lookback = self.slope_lookback_weeks
+        if weekly_df is None or len(weekly_df) < period + lookback:
             return None, None, 'unknown'
         
-        # 计算周线MA
-        weekly_ma = weekly_df['close'].rolling(window=self.weekly_ma_period).mean()
-        
-        if weekly_ma.isna().all():
-            return None, None, 'unknown'
+        # 斜率只需要最新和lookback周前两个MA值，只取尾部 period+lookback 个收盘价计算
+        close_tail = weekly_df['close'].to_numpy(dtype=np.float64)[-(period + lookback):]
+        ma_now = close_tail[lookback:].mean()
         
-        # 获取最近的MA值用于计算斜率
-        recent_ma = weekly_ma.tail(self.slope_lookback_weeks + 1)
-        if recent_ma.isna().any():
-            return weekly_ma.iloc[-1], None, 'unknown'
+        # 窗口内有缺失值时无法计算斜率
+        if np.isnan(close_tail).any():
+            return (None if np.isnan(ma_now) else ma_now), None, 'unknown'
         
-        ma_now = recent_ma.iloc[-1]
-        ma_before = recent_ma.iloc[0]
+        ma_before = close_tail[:period].mean()
         
         # 计算斜率（百分比变化）
         slope = (ma_now - ma_before) / ma_before if ma_before != 0 else 0
@@ -208,9 +233,9 @@ class WeeklyTrendFilter(BaseFilter):
         
         passed = {}
         rejected = {}
-        stats = {'up_up': 0, 'conflict': 0, 'unknown': 0, 'sideways': 0}
+        outcomes = np.full(len(data), _OUTCOME_ERROR, dtype=np.uint8)
         
-        for ticker, daily_df in data.items():
+        for i, (ticker, daily_df) in enumerate(data.items()):
             try:
                 state = self.analyze_stock(ticker, daily_df)
                 
@@ -218,28 +243,32 @@ class WeeklyTrendFilter(BaseFilter):
                     passed[ticker] = daily_df
                     # 统计
                     if state.weekly_trend == 'unknown':
-                        stats['unknown'] += 1
+                        outcomes[i] = _OUTCOME_UNKNOWN
                     elif state.daily_trend == state.weekly_trend:
-                        stats['up_up'] += 1
+                        outcomes[i] = _OUTCOME_ALIGNED
                     else:
-                        stats['sideways'] += 1
+                        outcomes[i] = _OUTCOME_SIDEWAYS
                 else:
                     rejected[ticker] = state.rejection_reason or "日/周趋势不一致"
-                    stats['conflict'] += 1
-                    self.logger.debug(
-                        f"{ticker}: 日线={state.daily_trend}, 周线={state.weekly_trend}, "
-                        f"周MA20斜率={state.weekly_ma20_slope:.4f if state.weekly_ma20_slope else 'N/A'}"
-                    )
+                    outcomes[i] = _OUTCOME_CONFLICT
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        slope = state.weekly_ma20_slope
+                        slope_str = f"{slope:.4f}" if slope is not None else "N/A"
+                        self.logger.debug(
+                            f"{ticker}: 日线={state.daily_trend}, 周线={state.weekly_trend}, "
+                            f"周MA20斜率={slope_str}"
+                        )
                     
             except Exception as e:
                 # 出错时优雅降级，允许通过
                 passed[ticker] = daily_df
                 self.logger.warning(f"分析 {ticker} 周趋势时出错: {e}，允许通过")
         
+        counts = np.bincount(outcomes, minlength=_NUM_OUTCOMES)
         self.logger.info(
             f"周趋势过滤: 通过 {len(passed)}/{len(data)}, 拒绝 {len(rejected)} | "
-            f"趋势一致={stats['up_up']}, 冲突={stats['conflict']}, "
-            f"横盘={stats['sideways']}, 数据缺失={stats['unknown']}"
+            f"趋势一致={counts[_OUTCOME_ALIGNED]}, 冲突={counts[_OUTCOME_CONFLICT]}, "
+            f"横盘={counts[_OUTCOME_SIDEWAYS]}, 数据缺失={counts[_OUTCOME_UNKNOWN]}"
         )
         
         return passed, rejected
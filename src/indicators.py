@@ -4,16 +4,97 @@ Technical Indicators - 技术指标计算模块
 """
 
 import logging
-from typing import Optional, List
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional, List, Dict
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .indicators_kernels import (
+    NUMBA_AVAILABLE, ALL_INDICATOR_COLUMNS, sma_kernel, ema_kernel, rsi_kernel,
+    rolling_std_kernel, adx_kernel, compute_all, compute_all_batch, warmup as warmup_kernels
+)
+
+try:
+    # 预编译（AOT）内核，由 python -m src.indicators_aot 生成，避免首次调用的JIT编译延迟
+    from ._indicators_aot import sma_kernel, ema_kernel, rsi_kernel, rolling_std_kernel
+except ImportError:
+    pass
+
+# add_all_indicators 的默认指标配置
+DEFAULT_INDICATORS_CONFIG = {
+    'ma_periods': [5, 10, 20, 50, 200],
+    'rsi_period': 14,
+    'macd': {'fast': 12, 'slow': 26, 'signal': 9},
+    'bollinger': {'period': 20, 'std_dev': 2},
+    'atr_period': 14,
+    'volume_ma_period': 20
+}
+
+# 内核结果缓存（LRU）：键为 (内核, 参数, 数组地址, 长度, 步长, 末值)，
+# 末值+长度作为只追加时间序列的快速内容签名
+_KERNEL_CACHE_SIZE = 128
+_kernel_cache = OrderedDict()
+_kernel_cache_lock = threading.Lock()
+
+
+def _cached_kernel(kernel, values: np.ndarray, param) -> np.ndarray:
+    """
+    带缓存地调用指标内核
+    
+    缓存只弱引用源数组的底层缓冲区，DataFrame释放后对应条目失效，
+    避免内存地址被复用时命中旧结果。
+    
+    Args:
+        kernel: 指标内核函数，签名为 kernel(values, param)
+        values: float64数组
+        param: 周期或平滑系数
+    
+    Returns:
+        np.ndarray: 只读的计算结果（调用方需复制后再修改）
+    """
+    if values.shape[0] == 0:
+        return kernel(values, param)
+    
+    owner = values
+    while isinstance(owner.base, np.ndarray):
+        owner = owner.base
+    key = (kernel, param, values.ctypes.data, values.shape[0], values.strides, values[-1].tobytes())
+    
+    with _kernel_cache_lock:
+        entry = _kernel_cache.get(key)
+        if entry is not None and entry[0]() is owner:
+            _kernel_cache.move_to_end(key)
+            return entry[1]
+    
+    result = kernel(values, param)
+    result.flags.writeable = False
+    
+    with _kernel_cache_lock:
+        _kernel_cache[key] = (weakref.ref(owner), result)
+        _kernel_cache.move_to_end(key)
+        while len(_kernel_cache) > _KERNEL_CACHE_SIZE:
+            _kernel_cache.popitem(last=False)
+    return result
 
 
 class TechnicalIndicators:
     """技术指标计算器"""
     
-    def __init__(self):
+    def __init__(self, warmup: bool = False):
+        """
+        初始化技术指标计算器
+        
+        Args:
+            warmup: 是否在初始化时预先编译numba内核，避免首次计算时的编译延迟
+        """
         self.logger = logging.getLogger(__name__)
+        
+        if warmup and NUMBA_AVAILABLE:
+            warmup_kernels()
+            self.logger.debug("指标内核预热完成")
     
     @staticmethod
     def calculate_sma(df: pd.DataFrame, period: int, column: str = 'close') -> pd.Series:
@@ -28,6 +109,10 @@ class TechnicalIndicators:
         Returns:
             pd.Series: SMA值
         """
+        if NUMBA_AVAILABLE:
+            values = df[column].to_numpy(dtype=np.float64)
+            return pd.Series(_cached_kernel(sma_kernel, values, period),
+                             index=df.index, name=column, copy=True)
         return df[column].rolling(window=period).mean()
     
     @staticmethod
@@ -43,6 +128,10 @@ class TechnicalIndicators:
         Returns:
             pd.Series: EMA值
         """
+        if NUMBA_AVAILABLE:
+            values = df[column].to_numpy(dtype=np.float64)
+            return pd.Series(_cached_kernel(ema_kernel, values, 2.0 / (period + 1)),
+                             index=df.index, name=column, copy=True)
         return df[column].ewm(span=period, adjust=False).mean()
     
     def calculate_multiple_ma(self, df: pd.DataFrame, periods: List[int]) -> pd.DataFrame:
@@ -58,6 +147,14 @@ class TechnicalIndicators:
         """
         df_result = df.copy()
         
+        if NUMBA_AVAILABLE:
+            # 只取一次收盘价数组，供所有周期复用
+            close = df_result['close'].to_numpy(dtype=np.float64)
+            for period in periods:
+                df_result[f'sma_{period}'] = _cached_kernel(sma_kernel, close, period).copy()
+                df_result[f'ema_{period}'] = _cached_kernel(ema_kernel, close, 2.0 / (period + 1)).copy()
+            return df_result
+        
         for period in periods:
             df_result[f'sma_{period}'] = self.calculate_sma(df, period)
             df_result[f'ema_{period}'] = self.calculate_ema(df, period)
@@ -77,6 +174,10 @@ class TechnicalIndicators:
         Returns:
             pd.Series: RSI值
         """
+        if NUMBA_AVAILABLE:
+            values = df[column].to_numpy(dtype=np.float64)
+            return pd.Series(_cached_kernel(rsi_kernel, values, period), index=df.index, copy=True)
+        
         delta = df[column].diff()
         
         gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
@@ -106,7 +207,12 @@ class TechnicalIndicators:
         ema_slow = self.calculate_ema(df, slow, column)
         
         macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+        if NUMBA_AVAILABLE:
+            signal_line = pd.Series(
+                ema_kernel(macd_line.to_numpy(), 2.0 / (signal + 1)), index=df.index
+            )
+        else:
+            signal_line = macd_line.ewm(span=signal, adjust=False).mean()
         macd_histogram = macd_line - signal_line
         
         return macd_line, signal_line, macd_histogram
@@ -126,8 +232,13 @@ class TechnicalIndicators:
         Returns:
             tuple: (中轨, 上轨, 下轨)
         """
-        middle_band = df[column].rolling(window=period).mean()
-        std = df[column].rolling(window=period).std()
+        if NUMBA_AVAILABLE:
+            values = df[column].to_numpy(dtype=np.float64)
+            middle_band = pd.Series(sma_kernel(values, period), index=df.index, name=column)
+            std = rolling_std_kernel(values, period)
+        else:
+            middle_band = df[column].rolling(window=period).mean()
+            std = df[column].rolling(window=period).std()
         
         upper_band = middle_band + (std * std_dev)
         lower_band = middle_band - (std * std_dev)
@@ -146,19 +257,36 @@ class TechnicalIndicators:
         Returns:
             pd.Series: ATR值
         """
-        high = df['high']
-        low = df['low']
-        close = df['close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
+        tr = TechnicalIndicators._true_range(df)
+        if NUMBA_AVAILABLE:
+            return pd.Series(sma_kernel(tr, period), index=df.index)
         
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
+        atr = pd.Series(tr, index=df.index).rolling(window=period).mean()
         
         return atr
     
+    @staticmethod
+    def _true_range(df: pd.DataFrame) -> np.ndarray:
+        """
+        计算真实波幅 TR = max(high-low, |high-前收|, |low-前收|)
+        
+        Args:
+            df: 数据DataFrame，必须包含high, low, close列
+        
+        Returns:
+            np.ndarray: TR值（与pandas的max(axis=1)一致，忽略NaN项）
+        """
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        
+        prev_close = np.empty_like(close)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
+        
+        # fmax忽略NaN，首行只剩 high-low
+        return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+    
     @staticmethod
     def calculate_adx(df: pd.DataFrame, period: int = 14) -> tuple:
         """
@@ -171,28 +299,33 @@ class TechnicalIndicators:
         Returns:
             tuple: (adx, plus_di, minus_di)
         """
-        high = df['high']
-        low = df['low']
-        close = df['close']
+        if NUMBA_AVAILABLE:
+            adx, plus_di, minus_di = adx_kernel(
+                df['high'].to_numpy(dtype=np.float64),
+                df['low'].to_numpy(dtype=np.float64),
+                df['close'].to_numpy(dtype=np.float64),
+                period
+            )
+            return (pd.Series(adx, index=df.index), pd.Series(plus_di, index=df.index),
+                    pd.Series(minus_di, index=df.index))
         
-        # 计算+DM和-DM
-        high_diff = high.diff()
-        low_diff = -low.diff()
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
         
-        plus_dm = high_diff.copy()
-        minus_dm = low_diff.copy()
+        # 计算+DM和-DM
+        high_diff = np.diff(high, prepend=np.nan)
+        low_diff = -np.diff(low, prepend=np.nan)
         
-        # +DM规则：high_diff > low_diff 且 high_diff > 0
-        plus_dm[~((high_diff > low_diff) & (high_diff > 0))] = 0
+        # +DM规则：high_diff > low_diff 且 high_diff > 0，否则为0
+        plus_dm = pd.Series(np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0.0),
+                            index=df.index)
         
-        # -DM规则：low_diff > high_diff 且 low_diff > 0
-        minus_dm[~((low_diff > high_diff) & (low_diff > 0))] = 0
+        # -DM规则：low_diff > high_diff 且 low_diff > 0，否则为0
+        minus_dm = pd.Series(np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0.0),
+                             index=df.index)
         
         # 计算TR (True Range)
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+        tr = pd.Series(TechnicalIndicators._true_range(df), index=df.index)
         
         # 平滑计算（使用Wilder's smoothing）
         atr = tr.ewm(alpha=1/period, adjust=False).mean()
@@ -250,7 +383,17 @@ class TechnicalIndicators:
         Returns:
             pd.Series: 价格变化率（百分比）
         """
-        return df['close'].pct_change(period) * 100
+        close = df['close'].to_numpy(dtype=np.float64)
+        change = np.empty_like(close)
+        change[:period] = np.nan
+        if period < len(close):
+            # 与pct_change一致：除零得到inf，不产生警告
+            with np.errstate(divide='ignore', invalid='ignore'):
+                np.divide(close[period:], close[:-period], out=change[period:])
+            change[period:] -= 1.0
+            change[period:] *= 100.0
+        
+        return pd.Series(change, index=df.index, name='close')
     
     @staticmethod
     def detect_ma_crossover(df: pd.DataFrame, short_period: int = 20, 
@@ -266,15 +409,17 @@ class TechnicalIndicators:
         Returns:
             pd.Series: 1表示金叉（向上突破），-1表示死叉（向下突破），0表示无交叉
         """
-        short_ma = df['close'].rolling(window=short_period).mean()
-        long_ma = df['close'].rolling(window=long_period).mean()
+        short_ma = TechnicalIndicators.calculate_sma(df, short_period).to_numpy()
+        long_ma = TechnicalIndicators.calculate_sma(df, long_period).to_numpy()
         
         # 当前短均线是否在长均线上方
-        above = (short_ma > long_ma).astype(int)
-        # 检测变化
-        crossover = above.diff()
+        above = (short_ma > long_ma).astype(np.int8)
+        # 检测变化（首行无前值，保持为NaN）
+        crossover = np.empty(len(above))
+        crossover[:1] = np.nan
+        crossover[1:] = above[1:] - above[:-1]
         
-        return crossover
+        return pd.Series(crossover, index=df.index)
     
     @staticmethod
     def detect_volume_surge(df: pd.DataFrame, period: int = 20, 
@@ -308,11 +453,14 @@ class TechnicalIndicators:
             pd.Series: True表示突破
         """
         # 计算前N天的最高价
-        rolling_high = df['high'].rolling(window=period).max()
+        rolling_high = TechnicalIndicators._rolling_extreme(df['high'], period, np.max)
         # 检测当前收盘价是否突破前期高点
-        breakout = df['close'] > rolling_high.shift(1)
+        prev_high = np.empty_like(rolling_high)
+        prev_high[:1] = np.nan
+        prev_high[1:] = rolling_high[:-1]
+        breakout = df['close'].to_numpy(dtype=np.float64) > prev_high
         
-        return breakout
+        return pd.Series(breakout, index=df.index)
     
     @staticmethod
     def detect_support_resistance(df: pd.DataFrame, period: int = 20, 
@@ -328,25 +476,49 @@ class TechnicalIndicators:
         Returns:
             tuple: (接近支撑位, 接近阻力位)
         """
-        rolling_low = df['low'].rolling(window=period).min()
-        rolling_high = df['high'].rolling(window=period).max()
+        rolling_low = TechnicalIndicators._rolling_extreme(df['low'], period, np.min)
+        rolling_high = TechnicalIndicators._rolling_extreme(df['high'], period, np.max)
+        close = df['close'].to_numpy(dtype=np.float64)
         
         # 当前价格距离支撑位/阻力位的距离
-        distance_to_support = (df['close'] - rolling_low) / rolling_low
-        distance_to_resistance = (rolling_high - df['close']) / df['close']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            distance_to_support = (close - rolling_low) / rolling_low
+            distance_to_resistance = (rolling_high - close) / close
         
-        near_support = distance_to_support < threshold
-        near_resistance = distance_to_resistance < threshold
+        near_support = pd.Series(distance_to_support < threshold, index=df.index)
+        near_resistance = pd.Series(distance_to_resistance < threshold, index=df.index)
         
         return near_support, near_resistance
     
-    def add_all_indicators(self, df: pd.DataFrame, config: dict = None) -> pd.DataFrame:
+    @staticmethod
+    def _rolling_extreme(series: pd.Series, period: int, reducer) -> np.ndarray:
+        """
+        滑动窗口最大/最小值（等价于 rolling(window=period).max()/min()）
+        
+        Args:
+            series: 数据列
+            period: 窗口长度
+            reducer: np.max 或 np.min
+        
+        Returns:
+            np.ndarray: 前period-1个及窗口内含NaN时为NaN
+        """
+        values = series.to_numpy(dtype=np.float64)
+        result = np.full_like(values, np.nan)
+        if len(values) >= period:
+            result[period - 1:] = reducer(sliding_window_view(values, period), axis=1)
+        return result
+    
+    def add_all_indicators(self, df: pd.DataFrame, config: dict = None,
+                           inplace: bool = False, dtype=np.float64) -> pd.DataFrame:
         """
         添加所有技术指标到DataFrame
         
         Args:
             df: 原始数据DataFrame
             config: 指标配置字典
+            inplace: 是否直接在df上添加列（避免复制原始数据）
+            dtype: 指标列的数据类型，np.float32可减半内存与带宽（内核累加仍为float64）
         
         Returns:
             pd.DataFrame: 包含所有指标的DataFrame
@@ -354,83 +526,267 @@ class TechnicalIndicators:
         if df is None or df.empty:
             return df
         
-        df_result = df.copy()
-        
         # 默认配置
         if config is None:
-            config = {
-                'ma_periods': [5, 10, 20, 50, 200],
-                'rsi_period': 14,
-                'macd': {'fast': 12, 'slow': 26, 'signal': 9},
-                'bollinger': {'period': 20, 'std_dev': 2},
-                'atr_period': 14,
-                'volume_ma_period': 20
-            }
+            config = DEFAULT_INDICATORS_CONFIG
         
+        columns = {}
         try:
-            # 移动平均线
-            if 'ma_periods' in config:
-                for period in config['ma_periods']:
-                    df_result[f'sma_{period}'] = self.calculate_sma(df_result, period)
-                    df_result[f'ema_{period}'] = self.calculate_ema(df_result, period)
-            
-            # RSI
-            if 'rsi_period' in config:
-                df_result['rsi'] = self.calculate_rsi(df_result, config['rsi_period'])
-            
-            # MACD
-            if 'macd' in config:
-                macd_config = config['macd']
-                macd, signal, hist = self.calculate_macd(
-                    df_result, 
-                    macd_config['fast'], 
-                    macd_config['slow'], 
-                    macd_config['signal']
-                )
-                df_result['macd'] = macd
-                df_result['macd_signal'] = signal
-                df_result['macd_hist'] = hist
-            
-            # 布林带
-            if 'bollinger' in config:
-                bb_config = config['bollinger']
-                middle, upper, lower = self.calculate_bollinger_bands(
-                    df_result, 
-                    bb_config['period'], 
-                    bb_config['std_dev']
-                )
-                df_result['bb_middle'] = middle
-                df_result['bb_upper'] = upper
-                df_result['bb_lower'] = lower
-            
-            # ATR
-            if 'atr_period' in config:
-                df_result['atr'] = self.calculate_atr(df_result, config['atr_period'])
-            
-            # ADX
-            if 'adx_period' in config:
-                adx, plus_di, minus_di = self.calculate_adx(df_result, config['adx_period'])
-                df_result['adx'] = adx
-                df_result['plus_di'] = plus_di
-                df_result['minus_di'] = minus_di
-            
-            # 成交量指标
-            if 'volume_ma_period' in config:
-                df_result['volume_ma'] = self.calculate_volume_ma(
-                    df_result, config['volume_ma_period']
-                )
-                df_result['volume_ratio'] = self.calculate_volume_ratio(
-                    df_result, config['volume_ma_period']
-                )
-            
-            # 价格变化
-            df_result['price_change_1d'] = self.calculate_price_change(df_result, 1)
-            df_result['price_change_5d'] = self.calculate_price_change(df_result, 5)
-            
-            self.logger.debug(f"已添加所有技术指标，共 {len(df_result.columns)} 列")
-            
+            if NUMBA_AVAILABLE:
+                self._add_indicators_fused(df, columns, config, dtype)
+            else:
+                self._add_indicators_pandas(df, columns, config)
         except Exception as e:
             self.logger.error(f"计算技术指标时出错: {e}")
         
+        df_result = self._attach_columns(df, columns, inplace, dtype)
+        self.logger.debug(f"已添加所有技术指标，共 {len(df_result.columns)} 列")
+        
         return df_result
-
+    
+    @staticmethod
+    def _attach_columns(df: pd.DataFrame, columns: Dict[str, object],
+                        inplace: bool, dtype=np.float64) -> pd.DataFrame:
+        """
+        将新计算的指标列加入DataFrame
+        
+        非inplace时一次性拼接新列，不先整体复制原始数据；
+        仅当新列与已有列重名时退回复制后逐列覆盖，以保持原有列位置。
+        
+        Args:
+            df: 原始数据DataFrame
+            columns: 新列 {列名: 数组或Series}
+            inplace: 是否直接在df上添加列
+            dtype: 指标列的数据类型
+        
+        Returns:
+            pd.DataFrame: 添加了新列的DataFrame
+        """
+        if np.dtype(dtype) != np.float64:
+            columns = {name: np.asarray(values, dtype=dtype) for name, values in columns.items()}
+        
+        if inplace or df.columns.isin(list(columns)).any():
+            df_result = df if inplace else df.copy()
+            for name, values in columns.items():
+                df_result[name] = values
+            return df_result
+        
+        if not columns:
+            return df.copy()
+        
+        new_columns = pd.DataFrame(
+            {name: np.asarray(values) for name, values in columns.items()}, index=df.index
+        )
+        return pd.concat([df, new_columns], axis=1)
+    
+    def add_all_indicators_batch(self, data: Dict[str, pd.DataFrame], config: dict = None,
+                                 inplace: bool = False, dtype=np.float64) -> Dict[str, pd.DataFrame]:
+        """
+        批量添加技术指标（numba可用时多只股票并行计算）
+        
+        Args:
+            data: 股票数据字典 {ticker: dataframe}
+            config: 指标配置字典
+            inplace: 是否直接在各DataFrame上添加列
+            dtype: 指标列的数据类型
+        
+        Returns:
+            Dict[str, pd.DataFrame]: 包含所有指标的数据字典，顺序与输入一致
+        """
+        if config is None:
+            config = DEFAULT_INDICATORS_CONFIG
+        
+        batch = {ticker: df for ticker, df in data.items() if df is not None and not df.empty}
+        if not NUMBA_AVAILABLE or not batch:
+            return {ticker: self.add_all_indicators(df, config, inplace, dtype)
+                    for ticker, df in data.items()}
+        
+        try:
+            # 按最长序列补齐为二维数组，lengths记录各自的有效长度
+            lengths = np.array([len(df) for df in batch.values()], dtype=np.int64)
+            arrays = {}
+            for column in ('close', 'high', 'low', 'volume'):
+                padded = np.full((len(batch), lengths.max()), np.nan, dtype=dtype)
+                for k, df in enumerate(batch.values()):
+                    padded[k, :lengths[k]] = df[column].to_numpy(dtype=dtype)
+                arrays[column] = padded
+            
+            ma_periods, params = self._fused_params(config)
+            out = compute_all_batch(arrays['close'], arrays['high'], arrays['low'],
+                                    arrays['volume'], lengths, ma_periods, *params)
+        except Exception as e:
+            self.logger.error(f"批量计算技术指标时出错，改为逐只计算: {e}")
+            return {ticker: self.add_all_indicators(df, config, inplace, dtype)
+                    for ticker, df in data.items()}
+        
+        results = {}
+        for k, (ticker, df) in enumerate(batch.items()):
+            columns = {}
+            try:
+                self._fused_columns(df, columns, out[k, :, :lengths[k]], config, ma_periods)
+            except Exception as e:
+                self.logger.error(f"计算技术指标时出错: {e}")
+            results[ticker] = self._attach_columns(df, columns, inplace, dtype)
+            self.logger.debug(f"已添加所有技术指标，共 {len(results[ticker].columns)} 列")
+        
+        return {ticker: results.get(ticker, df) for ticker, df in data.items()}
+    
+    @staticmethod
+    def _fused_params(config: dict) -> tuple:
+        """
+        将指标配置转换为融合内核的参数，周期为0表示跳过该指标
+        
+        Args:
+            config: 指标配置字典
+        
+        Returns:
+            tuple: (ma_periods数组, 其余周期参数元组)
+        """
+        ma_periods = np.asarray(config.get('ma_periods', []), dtype=np.int64)
+        macd_config = config.get('macd', {})
+        bb_config = config.get('bollinger', {})
+        params = (
+            config.get('rsi_period', 0),
+            macd_config.get('fast', 0),
+            macd_config.get('slow', 0),
+            macd_config.get('signal', 0),
+            bb_config.get('period', 0),
+            float(bb_config.get('std_dev', 0)),
+            config.get('atr_period', 0),
+            config.get('volume_ma_period', 0),
+        )
+        return ma_periods, params
+    
+    def _add_indicators_fused(self, df: pd.DataFrame, columns: dict, config: dict,
+                              dtype=np.float64):
+        """
+        使用融合内核一次计算全部指标（需要numba）
+        
+        Args:
+            df: 原始数据DataFrame
+            columns: 结果列字典（原地写入）
+            config: 指标配置字典
+            dtype: 输入数组与输出的数据类型
+        """
+        ma_periods, params = self._fused_params(config)
+        out = compute_all(
+            df['close'].to_numpy(dtype=dtype),
+            df['high'].to_numpy(dtype=dtype),
+            df['low'].to_numpy(dtype=dtype),
+            df['volume'].to_numpy(dtype=dtype),
+            ma_periods,
+            *params
+        )
+        self._fused_columns(df, columns, out, config, ma_periods)
+    
+    def _fused_columns(self, df: pd.DataFrame, columns: dict, out: np.ndarray,
+                       config: dict, ma_periods: np.ndarray):
+        """
+        将融合内核的输出按列整理到结果列字典
+        
+        Args:
+            df: 原始数据DataFrame
+            columns: 结果列字典（原地写入）
+            out: compute_all 的输出数组
+            config: 指标配置字典
+            ma_periods: 均线周期数组
+        """
+        row = dict(zip(ALL_INDICATOR_COLUMNS, range(2 * len(ma_periods), len(out))))
+        
+        # 按原有列顺序写入，未配置的指标不添加
+        for j, period in enumerate(ma_periods):
+            columns[f'sma_{period}'] = out[2 * j]
+            columns[f'ema_{period}'] = out[2 * j + 1]
+        
+        names = []
+        if 'rsi_period' in config:
+            names.append('rsi')
+        if 'macd' in config:
+            names += ['macd', 'macd_signal', 'macd_hist']
+        if 'bollinger' in config:
+            names += ['bb_middle', 'bb_upper', 'bb_lower']
+        if 'atr_period' in config:
+            names.append('atr')
+        for col in names:
+            columns[col] = out[row[col]]
+        
+        # ADX
+        if 'adx_period' in config:
+            adx, plus_di, minus_di = self.calculate_adx(df, config['adx_period'])
+            columns['adx'] = adx
+            columns['plus_di'] = plus_di
+            columns['minus_di'] = minus_di
+        
+        names = ['price_change_1d', 'price_change_5d']
+        if 'volume_ma_period' in config:
+            names = ['volume_ma', 'volume_ratio'] + names
+        for col in names:
+            columns[col] = out[row[col]]
+    
+    def _add_indicators_pandas(self, df: pd.DataFrame, columns: dict, config: dict):
+        """
+        逐个指标计算（未安装numba时使用）
+        
+        Args:
+            df: 原始数据DataFrame
+            columns: 结果列字典（原地写入）
+            config: 指标配置字典
+        """
+        # 移动平均线
+        if 'ma_periods' in config:
+            for period in config['ma_periods']:
+                columns[f'sma_{period}'] = self.calculate_sma(df, period)
+                columns[f'ema_{period}'] = self.calculate_ema(df, period)
+        
+        # RSI
+        if 'rsi_period' in config:
+            columns['rsi'] = self.calculate_rsi(df, config['rsi_period'])
+        
+        # MACD
+        if 'macd' in config:
+            macd_config = config['macd']
+            macd, signal, hist = self.calculate_macd(
+                df, 
+                macd_config['fast'], 
+                macd_config['slow'], 
+                macd_config['signal']
+            )
+            columns['macd'] = macd
+            columns['macd_signal'] = signal
+            columns['macd_hist'] = hist
+        
+        # 布林带
+        if 'bollinger' in config:
+            bb_config = config['bollinger']
+            middle, upper, lower = self.calculate_bollinger_bands(
+                df, 
+                bb_config['period'], 
+                bb_config['std_dev']
+            )
+            columns['bb_middle'] = middle
+            columns['bb_upper'] = upper
+            columns['bb_lower'] = lower
+        
+        # ATR
+        if 'atr_period' in config:
+            columns['atr'] = self.calculate_atr(df, config['atr_period'])
+        
+        # ADX
+        if 'adx_period' in config:
+            adx, plus_di, minus_di = self.calculate_adx(df, config['adx_period'])
+            columns['adx'] = adx
+            columns['plus_di'] = plus_di
+            columns['minus_di'] = minus_di
+        
+        # 成交量指标
+        if 'volume_ma_period' in config:
+            columns['volume_ma'] = self.calculate_volume_ma(
+                df, config['volume_ma_period']
+            )
+            columns['volume_ratio'] = self.calculate_volume_ratio(
+                df, config['volume_ma_period']
+            )
+        
+        # 价格变化
+        columns['price_change_1d'] = self.calculate_price_change(df, 1)
+        columns['price_change_5d'] = self.calculate_price_change(df, 5)
@@ -0,0 +1,54 @@
+"""
+Indicators AOT - 指标内核预编译
+使用 numba.pycc 将常用指标内核提前编译为本地扩展模块 src/_indicators_aot，
+消除每个新进程首次调用时的JIT编译延迟
+
+用法（在项目根目录执行，需要numba与C编译器）:
+    python -m src.indicators_aot
+
+生成的扩展模块存在时，TechnicalIndicators 优先使用预编译版本；
+融合内核 compute_all / compute_all_batch 仍为JIT编译（cache=True，首次编译后缓存到磁盘）。
+"""
+
+from pathlib import Path
+
+from numba.pycc import CC
+
+from .indicators_kernels import sma_kernel, ema_kernel, rsi_kernel, rolling_std_kernel
+
+AOT_MODULE_NAME = '_indicators_aot'
+
+# 导出名 -> (JIT内核, 签名)，签名固定为float64输入
+# adx_kernel 依赖 error_model='numpy' 的除零语义，pycc不支持该选项，因此不预编译
+EXPORTS = {
+    'sma_kernel': (sma_kernel, 'f8[:](f8[:], i8)'),
+    'ema_kernel': (ema_kernel, 'f8[:](f8[:], f8)'),
+    'rsi_kernel': (rsi_kernel, 'f8[:](f8[:], i8)'),
+    'rolling_std_kernel': (rolling_std_kernel, 'f8[:](f8[:], i8)'),
+}
+
+
+def build(output_dir: Path = None) -> Path:
+    """
+    编译预编译内核模块
+
+    Args:
+        output_dir: 输出目录（默认为src目录）
+
+    Returns:
+        Path: 输出目录
+    """
+    output_dir = Path(output_dir or Path(__file__).parent)
+
+    cc = CC(AOT_MODULE_NAME)
+    cc.output_dir = str(output_dir)
+    cc.verbose = True
+    for name, (kernel, signature) in EXPORTS.items():
+        cc.export(name, signature)(kernel.py_func)
+    cc.compile()
+
+    return output_dir
+
+
+if __name__ == '__main__':
+    print(f"已生成预编译内核模块: {build() / AOT_MODULE_NAME}")
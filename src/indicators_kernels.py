@@ -0,0 +1,387 @@
+"""
+Indicator Kernels - 技术指标计算内核
+基于numba JIT编译的单次遍历递推实现，供TechnicalIndicators调用
+
+numba为可选依赖：未安装时NUMBA_AVAILABLE为False，TechnicalIndicators回退到pandas实现。
+各内核的NaN处理与对应的pandas实现保持一致（rolling要求窗口内数据完整，ewm为adjust=False）。
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """numba未安装时的占位装饰器，原样返回函数"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, nogil=True)
+def sma_kernel(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    简单移动平均（滑动窗口累加，O(N)）
+
+    Args:
+        x: float64数组
+        period: 窗口长度
+
+    Returns:
+        np.ndarray: SMA值，窗口内有NaN或数据不足时为NaN
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    total = 0.0
+    nobs = 0
+    for i in range(n):
+        value = x[i]
+        if not np.isnan(value):
+            total += value
+            nobs += 1
+        if i >= period:
+            old = x[i - period]
+            if not np.isnan(old):
+                total -= old
+                nobs -= 1
+        if nobs == period:
+            out[i] = total / period
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ema_kernel(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    指数移动平均，等价于 ewm(alpha=alpha, adjust=False).mean()
+
+    Args:
+        x: float64数组
+        alpha: 平滑系数（span=N 时为 2/(N+1)，Wilder平滑为 1/N）
+
+    Returns:
+        np.ndarray: EMA值
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+
+    old_wt_factor = 1.0 - alpha
+    weighted = x[0]
+    has_obs = not np.isnan(weighted)
+    out[0] = weighted if has_obs else np.nan
+    old_wt = 1.0
+    for i in range(1, n):
+        cur = x[i]
+        is_obs = not np.isnan(cur)
+        has_obs = has_obs or is_obs
+        if not np.isnan(weighted):
+            # 缺失值期间旧权重继续衰减
+            old_wt *= old_wt_factor
+            if is_obs:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_obs:
+            weighted = cur
+        out[i] = weighted if has_obs else np.nan
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rsi_kernel(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    相对强弱指标（涨跌幅的简单移动平均）
+
+    Args:
+        x: 收盘价float64数组
+        period: 周期
+
+    Returns:
+        np.ndarray: RSI值
+    """
+    n = x.shape[0]
+    gain = np.zeros(n)
+    loss = np.zeros(n)
+    for i in range(1, n):
+        delta = x[i] - x[i - 1]
+        if delta > 0:
+            gain[i] = delta
+        elif delta < 0:
+            loss[i] = -delta
+
+    avg_gain = sma_kernel(gain, period)
+    avg_loss = sma_kernel(loss, period)
+    out = np.empty(n)
+    for i in range(n):
+        if avg_loss[i] == 0.0:
+            # 无下跌：RSI=100；涨跌均为0时无定义
+            out[i] = 100.0 if avg_gain[i] > 0 else np.nan
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain[i] / avg_loss[i])
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rolling_std_kernel(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    滚动样本标准差（ddof=1），Welford增量更新：新值加入、旧值移出，O(N)
+
+    Args:
+        x: float64数组
+        period: 窗口长度
+
+    Returns:
+        np.ndarray: 标准差，窗口内有NaN或数据不足时为NaN
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    nobs = 0
+    mean = 0.0
+    ssqdm = 0.0
+    for i in range(n):
+        value = x[i]
+        if not np.isnan(value):
+            nobs += 1
+            delta = value - mean
+            mean += delta / nobs
+            ssqdm += (nobs - 1) * delta * delta / nobs
+        if i >= period:
+            old = x[i - period]
+            if not np.isnan(old):
+                nobs -= 1
+                if nobs > 0:
+                    delta = old - mean
+                    mean -= delta / nobs
+                    ssqdm -= (nobs + 1) * delta * delta / nobs
+                else:
+                    mean = 0.0
+                    ssqdm = 0.0
+        if nobs == period and nobs > 1:
+            out[i] = np.sqrt(max(ssqdm, 0.0) / (nobs - 1))
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True, nogil=True)
+def true_range_kernel(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    真实波幅 TR = max(high-low, |high-前收|, |low-前收|)，忽略其中的NaN项
+
+    Returns:
+        np.ndarray: TR值，三项均为NaN时为NaN
+    """
+    n = close.shape[0]
+    out = np.empty(n)
+    for i in range(n):
+        tr = high[i] - low[i]
+        if i > 0:
+            prev_close = close[i - 1]
+            for candidate in (abs(high[i] - prev_close), abs(low[i] - prev_close)):
+                if np.isnan(tr) or candidate > tr:
+                    tr = candidate
+        out[i] = tr
+    return out
+
+
+@njit(cache=True, nogil=True)
+def pct_change_kernel(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    价格变化率（百分比）
+
+    Returns:
+        np.ndarray: (x[i] / x[i-period] - 1) * 100，前period个为NaN
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    out[:min(period, n)] = np.nan
+    if period < n:
+        out[period:] = (x[period:] / x[:n - period] - 1.0) * 100.0
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _wilder_step(smoothed: float, old_wt: float, cur: float, alpha: float):
+    """
+    ewm(alpha, adjust=False) 的单步递推，返回更新后的 (smoothed, old_wt)
+
+    smoothed 初始为NaN、old_wt 初始为1.0，与 ema_kernel 的NaN处理一致。
+    """
+    if not np.isnan(smoothed):
+        old_wt *= 1.0 - alpha
+        if not np.isnan(cur):
+            if smoothed != cur:
+                smoothed = (old_wt * smoothed + alpha * cur) / (old_wt + alpha)
+            old_wt = 1.0
+    elif not np.isnan(cur):
+        smoothed = cur
+    return smoothed, old_wt
+
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def adx_kernel(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int):
+    """
+    ADX指标，单次遍历完成 +DM/-DM、TR、Wilder平滑（alpha=1/period）、DI、DX与ADX
+
+    error_model='numpy' 使除零得到inf/NaN而非抛出异常，与pandas结果一致。
+
+    Returns:
+        tuple: (adx, plus_di, minus_di)
+    """
+    n = close.shape[0]
+    adx = np.empty(n)
+    plus_di = np.empty(n)
+    minus_di = np.empty(n)
+    alpha = 1.0 / period
+
+    atr_s = pdm_s = mdm_s = adx_s = np.nan
+    atr_wt = pdm_wt = mdm_wt = adx_wt = 1.0
+    for i in range(n):
+        tr = high[i] - low[i]
+        plus_dm = 0.0
+        minus_dm = 0.0
+        if i > 0:
+            prev_close = close[i - 1]
+            for candidate in (abs(high[i] - prev_close), abs(low[i] - prev_close)):
+                if np.isnan(tr) or candidate > tr:
+                    tr = candidate
+            up = high[i] - high[i - 1]
+            down = low[i - 1] - low[i]
+            # NaN参与的比较均为False，对应DM记为0
+            if up > down and up > 0:
+                plus_dm = up
+            if down > up and down > 0:
+                minus_dm = down
+
+        atr_s, atr_wt = _wilder_step(atr_s, atr_wt, tr, alpha)
+        pdm_s, pdm_wt = _wilder_step(pdm_s, pdm_wt, plus_dm, alpha)
+        mdm_s, mdm_wt = _wilder_step(mdm_s, mdm_wt, minus_dm, alpha)
+
+        pdi = 100.0 * pdm_s / atr_s
+        mdi = 100.0 * mdm_s / atr_s
+        dx = 100.0 * abs(pdi - mdi) / (pdi + mdi)
+        adx_s, adx_wt = _wilder_step(adx_s, adx_wt, dx, alpha)
+
+        plus_di[i] = pdi
+        minus_di[i] = mdi
+        adx[i] = adx_s
+    return adx, plus_di, minus_di
+
+
+# compute_all 输出中，均线列之后各指标的行偏移
+ALL_INDICATOR_COLUMNS = (
+    'rsi', 'macd', 'macd_signal', 'macd_hist',
+    'bb_middle', 'bb_upper', 'bb_lower', 'atr',
+    'volume_ma', 'volume_ratio', 'price_change_1d', 'price_change_5d',
+)
+
+
+@njit(cache=True, nogil=True)
+def compute_all(close: np.ndarray, high: np.ndarray, low: np.ndarray, volume: np.ndarray,
+                ma_periods: np.ndarray, rsi_period: int,
+                macd_fast: int, macd_slow: int, macd_signal: int,
+                bb_period: int, bb_std_dev: float, atr_period: int,
+                volume_period: int) -> np.ndarray:
+    """
+    一次调用计算全部指标，结果写入同一块预分配的输出数组
+
+    周期参数为0表示跳过该指标（对应行保持NaN）。输出数组与close同为float32/float64，
+    各内核内部的累加与递推状态始终为float64，避免float32输入下的误差累积。
+
+    Returns:
+        np.ndarray: 形状 (2*len(ma_periods) + len(ALL_INDICATOR_COLUMNS), N)，
+            先按周期依次为 sma_p, ema_p，之后按 ALL_INDICATOR_COLUMNS 顺序排列
+    """
+    n = close.shape[0]
+    n_ma = ma_periods.shape[0]
+    base = 2 * n_ma
+    out = np.full((base + len(ALL_INDICATOR_COLUMNS), n), np.nan, dtype=close.dtype)
+
+    for j in range(n_ma):
+        period = ma_periods[j]
+        out[2 * j] = sma_kernel(close, period)
+        out[2 * j + 1] = ema_kernel(close, 2.0 / (period + 1))
+
+    if rsi_period > 0:
+        out[base] = rsi_kernel(close, rsi_period)
+
+    if macd_fast > 0:
+        macd = ema_kernel(close, 2.0 / (macd_fast + 1)) - ema_kernel(close, 2.0 / (macd_slow + 1))
+        signal = ema_kernel(macd, 2.0 / (macd_signal + 1))
+        out[base + 1] = macd
+        out[base + 2] = signal
+        out[base + 3] = macd - signal
+
+    if bb_period > 0:
+        middle = sma_kernel(close, bb_period)
+        width = rolling_std_kernel(close, bb_period) * bb_std_dev
+        out[base + 4] = middle
+        out[base + 5] = middle + width
+        out[base + 6] = middle - width
+
+    if atr_period > 0:
+        out[base + 7] = sma_kernel(true_range_kernel(high, low, close), atr_period)
+
+    if volume_period > 0:
+        volume_ma = sma_kernel(volume, volume_period)
+        out[base + 8] = volume_ma
+        out[base + 9] = volume / volume_ma
+
+    out[base + 10] = pct_change_kernel(close, 1)
+    out[base + 11] = pct_change_kernel(close, 5)
+    return out
+
+
+@njit(cache=True, nogil=True, parallel=True)
+def compute_all_batch(closes: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                      volumes: np.ndarray, lengths: np.ndarray,
+                      ma_periods: np.ndarray, rsi_period: int,
+                      macd_fast: int, macd_slow: int, macd_signal: int,
+                      bb_period: int, bb_std_dev: float, atr_period: int,
+                      volume_period: int) -> np.ndarray:
+    """
+    多只股票并行执行 compute_all
+
+    输入为按最长序列补齐的二维数组 (n_tickers, max_len)，lengths为各股票的有效长度。
+
+    Returns:
+        np.ndarray: 形状 (n_tickers, 2*len(ma_periods) + len(ALL_INDICATOR_COLUMNS), max_len)，
+            每只股票只有前 lengths[k] 列有效
+    """
+    n_tickers = closes.shape[0]
+    n_rows = 2 * ma_periods.shape[0] + len(ALL_INDICATOR_COLUMNS)
+    out = np.full((n_tickers, n_rows, closes.shape[1]), np.nan, dtype=closes.dtype)
+    for k in prange(n_tickers):
+        length = lengths[k]
+        out[k, :, :length] = compute_all(
+            closes[k, :length], highs[k, :length], lows[k, :length], volumes[k, :length],
+            ma_periods, rsi_period, macd_fast, macd_slow, macd_signal,
+            bb_period, bb_std_dev, atr_period, volume_period
+        )
+    return out
+
+
+def warmup():
+    """
+    用小规模合成数据调用一次各内核，触发JIT编译
+
+    配合 cache=True，编译结果会持久化到 __pycache__，之后的进程直接加载缓存。
+    """
+    x = np.arange(64, dtype=np.float64) + 1.0
+    periods = np.array([5], dtype=np.int64)
+    sma_kernel(x, 5)
+    ema_kernel(x, 0.1)
+    rsi_kernel(x, 14)
+    rolling_std_kernel(x, 5)
+    adx_kernel(x + 1.0, x - 1.0, x, 14)
+    compute_all(x, x + 1.0, x - 1.0, x, periods, 14, 12, 26, 9, 20, 2.0, 14, 20)
+    compute_all_batch(x.reshape(1, -1), x.reshape(1, -1) + 1.0, x.reshape(1, -1) - 1.0,
+                      x.reshape(1, -1), np.array([64], dtype=np.int64), periods,
+                      14, 12, 26, 9, 20, 2.0, 14, 20)
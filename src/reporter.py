@@ -11,6 +11,34 @@ import pandas as pd
 from pathlib import Path
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+
+# 详细信息字段名的中文翻译
+_TRANSLATION_MAP = {
+    'short_ma': '短期均线',
+    'long_ma': '长期均线',
+    'volume_ratio': '成交量倍数',
+    'price_change': '涨跌幅(%)',
+    'volume': '成交量',
+    'recent_high': '前期高点',
+    'breakout_pct': '突破幅度(%)',
+    'rsi': 'RSI指标',
+    'rsi_prev': '前日RSI',
+    'macd': 'MACD',
+    'signal_line': '信号线',
+}
+
 
 class Reporter:
     """报告生成器"""
@@ -55,7 +83,7 @@ class Reporter:
         # 保存为CSV
         if format in ['csv', 'both']:
             csv_path = self.output_dir / f"{base_filename}.csv"
-            df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+            self._write_csv(df, csv_path)
             saved_files.append(str(csv_path))
             self.logger.info(f"CSV报告已保存: {csv_path}")
         
@@ -80,32 +108,30 @@ class Reporter:
         Returns:
             pd.DataFrame: 整理后的数据
         """
+        # 生成时间对所有行相同，只计算一次并放在首列
+        screening_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         rows = []
         
         for result in results:
             row = {
+                '筛选时间': screening_time,
                 '股票代码': result.get('ticker', ''),
                 '信号类型': result.get('signal', ''),
                 '当前价格': result.get('price', 0),
             }
             
-            # 添加详细信息
+            # 添加详细信息（键名在构建DataFrame后统一转换为中文）
             if include_details and 'details' in result:
                 details = result['details']
                 if isinstance(details, dict):
-                    for key, value in details.items():
-                        # 转换键名为中文（可选）
-                        column_name = self._translate_key(key)
-                        row[column_name] = value
+                    row.update(details)
                 else:
                     row['详细信息'] = str(details)
             
             rows.append(row)
         
-        df = pd.DataFrame(rows)
-        
-        # 添加生成时间
-        df.insert(0, '筛选时间', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        df = pd.DataFrame(rows, columns=None if rows else ['筛选时间'])
+        df.rename(columns=_TRANSLATION_MAP, inplace=True)
         
         return df
     
@@ -119,21 +145,29 @@ class Reporter:
         Returns:
             str: 中文键名
         """
-        translation_map = {
-            'short_ma': '短期均线',
-            'long_ma': '长期均线',
-            'volume_ratio': '成交量倍数',
-            'price_change': '涨跌幅(%)',
-            'volume': '成交量',
-            'recent_high': '前期高点',
-            'breakout_pct': '突破幅度(%)',
-            'rsi': 'RSI指标',
-            'rsi_prev': '前日RSI',
-            'macd': 'MACD',
-            'signal_line': '信号线',
-        }
+        return _TRANSLATION_MAP.get(key, key)
+    
+    def _write_csv(self, df: pd.DataFrame, file_path: Path):
+        """
+        保存CSV文件（UTF-8 BOM编码，便于Excel直接打开）
         
-        return translation_map.get(key, key)
+        安装了pyarrow时使用其C++ CSV写入器，否则或转换失败时使用pandas。
+        
+        Args:
+            df: 数据DataFrame
+            file_path: 文件路径
+        """
+        if pacsv is not None:
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                with open(file_path, 'wb') as f:
+                    f.write(b'\xef\xbb\xbf')
+                    pacsv.write_csv(table, f)
+                return
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                self.logger.debug(f"pyarrow写入CSV失败，改用pandas: {e}")
+        
+        df.to_csv(file_path, index=False, encoding='utf-8-sig')
     
     def _save_excel_report(self, df: pd.DataFrame, file_path: Path):
         """
@@ -144,30 +178,40 @@ class Reporter:
             file_path: 文件路径
         """
         try:
-            # 创建Excel writer
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='筛选结果')
-                
-                # 获取worksheet对象
-                worksheet = writer.sheets['筛选结果']
-                
-                # 自动调整列宽
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-                # 冻结首行
-                worksheet.freeze_panes = 'A2'
+            from openpyxl import Workbook
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.styles import Font
+            from openpyxl.utils import get_column_letter
+            
+            # 只写模式：逐行流式写入，不在内存中构建完整的Cell对象
+            workbook = Workbook(write_only=True)
+            worksheet = workbook.create_sheet('筛选结果')
+            
+            # 自动调整列宽（写入数据前设置，按列向量化计算最大字符长度）
+            for idx, column in enumerate(df.columns, start=1):
+                max_length = len(str(column))
+                if len(df) > 0:
+                    # 空单元格按 'None' 计宽；map(str) 不会像 astype(str) 那样在新版pandas中保留NaN
+                    series = df[column]
+                    lengths = series.map(str).str.len().where(series.notna(), len('None'))
+                    max_length = max(max_length, int(lengths.max()))
+                worksheet.column_dimensions[get_column_letter(idx)].width = min(max_length + 2, 50)
+            
+            # 冻结首行
+            worksheet.freeze_panes = 'A2'
+            
+            header = []
+            for column in df.columns:
+                cell = WriteOnlyCell(worksheet, value=str(column))
+                cell.font = Font(bold=True)
+                header.append(cell)
+            worksheet.append(header)
+            
+            # NaN写为空单元格
+            for row in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+                worksheet.append(row)
+            
+            workbook.save(file_path)
             
             self.logger.info(f"Excel报告已格式化并保存")
             
@@ -211,7 +255,7 @@ class Reporter:
                     summary_df = pd.DataFrame(summary_data)
                     summary_df.to_excel(writer, sheet_name='汇总', index=False)
                     
-                    # 为每个策略创建单独的sheet
+                    # 为每个策略创建单独的sheet（只包含该策略自己的列，保留各列原有类型）
                     for strategy_name, results in all_results.items():
                         if results:
                             df = self._results_to_dataframe(results, include_details=True)
@@ -227,17 +271,11 @@ class Reporter:
         
         # CSV格式：合并所有结果
         if format in ['csv', 'both']:
-            all_rows = []
-            for strategy_name, results in all_results.items():
-                for result in results:
-                    result_copy = result.copy()
-                    result_copy['strategy'] = strategy_name
-                    all_rows.append(result_copy)
-            
+            all_rows = [result for results in all_results.values() for result in results]
             if all_rows:
-                df = self._results_to_dataframe(all_rows, include_details=True)
                 csv_path = self.output_dir / f"summary_report_{timestamp}.csv"
-                df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+                all_df = self._results_to_dataframe(all_rows, include_details=True)
+                self._write_csv(all_df, csv_path)
                 self.logger.info(f"CSV汇总报告已保存: {csv_path}")
                 return str(csv_path)
         
@@ -253,20 +291,27 @@ class Reporter:
         Returns:
             List[str]: 报告文件路径列表
         """
-        reports = []
         cutoff_time = datetime.now().timestamp() - (days * 24 * 3600)
         
-        for file_path in self.output_dir.glob('*.csv'):
-            if file_path.stat().st_mtime >= cutoff_time:
-                reports.append(str(file_path))
-        
-        for file_path in self.output_dir.glob('*.xlsx'):
-            if file_path.stat().st_mtime >= cutoff_time:
-                reports.append(str(file_path))
+        reports = [(path, mtime) for path, mtime in self._scan_reports() if mtime >= cutoff_time]
         
         # 按修改时间排序
-        reports.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+        reports.sort(key=lambda item: item[1], reverse=True)
         
+        return [path for path, _ in reports]
+    
+    def _scan_reports(self) -> List[tuple]:
+        """
+        扫描报告目录下的CSV/Excel报告（每个文件只stat一次）
+        
+        Returns:
+            List[tuple]: [(文件路径, 修改时间), ...]
+        """
+        reports = []
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(('.csv', '.xlsx')) and entry.is_file():
+                    reports.append((entry.path, entry.stat().st_mtime))
         return reports
     
     def clean_old_reports(self, keep_days: int = 30):
@@ -279,14 +324,9 @@ class Reporter:
         cutoff_time = datetime.now().timestamp() - (keep_days * 24 * 3600)
         deleted_count = 0
         
-        for file_path in self.output_dir.glob('*.csv'):
-            if file_path.stat().st_mtime < cutoff_time:
-                file_path.unlink()
-                deleted_count += 1
-        
-        for file_path in self.output_dir.glob('*.xlsx'):
-            if file_path.stat().st_mtime < cutoff_time:
-                file_path.unlink()
+        for file_path, mtime in self._scan_reports():
+            if mtime < cutoff_time:
+                os.unlink(file_path)
                 deleted_count += 1
         
         if deleted_count > 0:
@@ -326,8 +366,22 @@ class Reporter:
         
         # 保存JSON
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, indent=2, ensure_ascii=False)
+            # 优先使用orjson（可直接序列化numpy标量），不可用或失败时回退到标准库json
+            payload = None
+            if orjson is not None:
+                try:
+                    payload = orjson.dumps(
+                        report_data,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                    )
+                except orjson.JSONEncodeError as e:
+                    self.logger.debug(f"orjson序列化失败，改用json: {e}")
+            
+            if payload is not None:
+                Path(output_path).write_bytes(payload)
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(report_data, f, indent=2, ensure_ascii=False)
             
             self.logger.info(f"JSON报告已保存: {output_path}")
             return str(output_path)
@@ -3,17 +3,71 @@ Scheduler - 定时调度器模块
 管理定时任务的执行
 """
 
+import heapq
 import logging
-import schedule
+import threading
 import time
-from datetime import datetime
-from typing import Callable, List, Dict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional
 import pytz
 
 
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+@lru_cache(maxsize=64)
+def _tz(name: str):
+    """获取时区对象（缓存，避免重复解析时区数据）"""
+    return pytz.timezone(name)
+
+
+def _now(name: str) -> datetime:
+    """获取指定时区的当前时间"""
+    return datetime.now(_tz(name))
+
+
+def _parse_time(time_str: str) -> tuple:
+    """解析 "HH:MM" 或 "HH:MM:SS" 格式的时间字符串"""
+    parts = [int(part) for part in time_str.split(':')]
+    if len(parts) not in (2, 3):
+        raise ValueError(f"无效的时间格式: {time_str}")
+    hour, minute = parts[0], parts[1]
+    second = parts[2] if len(parts) == 3 else 0
+    return hour, minute, second
+
+
+def _next_fire_time(tz, hour: int, minute: int, second: int = 0,
+                    weekday: Optional[int] = None) -> float:
+    """
+    计算指定时区内下一次到达给定时刻的时间戳
+    
+    Args:
+        tz: pytz时区对象
+        hour: 小时
+        minute: 分钟
+        second: 秒
+        weekday: 星期几（0=周一），为None时表示每天
+    
+    Returns:
+        float: 下次执行的Unix时间戳
+    """
+    now = datetime.now(tz)
+    target = now.replace(tzinfo=None, hour=hour, minute=minute, second=second, microsecond=0)
+    if weekday is not None:
+        target += timedelta(days=(weekday - target.weekday()) % 7)
+    step = timedelta(days=1 if weekday is None else 7)
+    # 按本地时间推进后再localize，保证夏令时切换前后的钟点正确
+    while tz.localize(target) <= now:
+        target += step
+    return tz.localize(target).timestamp()
+
+
 class TaskScheduler:
     """任务调度器"""
     
+    __slots__ = ('timezone', 'logger', 'jobs', '_heap', '_stop', '_mh_cache', '_mkt_bounds_cache')
+    
     def __init__(self, timezone: str = 'US/Eastern'):
         """
         初始化任务调度器
@@ -21,9 +75,31 @@ class TaskScheduler:
         Args:
             timezone: 时区（默认美东时间）
         """
-        self.timezone = pytz.timezone(timezone)
+        self.timezone = _tz(timezone)
         self.logger = logging.getLogger(__name__)
-        self.jobs = []
+        # 任务描述，下标即任务ID
+        self.jobs: List[str] = []
+        # 最小堆：(下次执行时间戳, 任务ID, 任务函数, 计算下次执行时间的函数)
+        self._heap: List[tuple] = []
+        # 停止信号，stop() 置位后主循环立即退出休眠
+        self._stop = threading.Event()
+        # is_market_hours 的单条目缓存：(时区, 分钟序号) -> 结果
+        self._mh_cache: Dict[tuple, bool] = {}
+        # 当日开收盘时间缓存：(日期, 时区, (开盘时间, 收盘时间))
+        self._mkt_bounds_cache: tuple = (None, None, None)
+    
+    def _add_job(self, job_wrapper: Callable, next_fire: Callable[[], float], description: str):
+        """
+        将任务加入调度堆
+        
+        Args:
+            job_wrapper: 任务函数
+            next_fire: 返回下次执行时间戳的函数，每次执行后调用以重新调度
+            description: 任务描述
+        """
+        job_id = len(self.jobs)
+        self.jobs.append(description)
+        heapq.heappush(self._heap, (next_fire(), job_id, job_wrapper, next_fire))
     
     def add_daily_job(self, func: Callable, time_str: str, timezone: str = None):
         """
@@ -35,9 +111,10 @@ class TaskScheduler:
             timezone: 时区（可选，使用初始化时的时区）
         """
         if timezone:
-            tz = pytz.timezone(timezone)
+            tz = _tz(timezone)
         else:
             tz = self.timezone
+        hour, minute, second = _parse_time(time_str)
         
         # 创建包装函数，在正确时区执行
         def job_wrapper():
@@ -49,9 +126,11 @@ class TaskScheduler:
             except Exception as e:
                 self.logger.error(f"任务 {func.__name__} 执行失败: {e}")
         
-        # 添加到schedule
-        job = schedule.every().day.at(time_str).do(job_wrapper)
-        self.jobs.append(job)
+        self._add_job(
+            job_wrapper,
+            lambda: _next_fire_time(tz, hour, minute, second),
+            f"每日任务 {func.__name__} at {time_str} ({tz})"
+        )
         
         self.logger.info(f"已添加定时任务: {func.__name__} at {time_str} ({tz})")
     
@@ -61,8 +140,11 @@ class TaskScheduler:
         
         Args:
             func: 要执行的函数
-            interval_minutes: 间隔分钟数
+            interval_minutes: 间隔分钟数（必须大于0，否则抛出ValueError）
         """
+        if interval_minutes <= 0:
+            raise ValueError(f"无效的间隔分钟数: {interval_minutes}")
+        
         def job_wrapper():
             self.logger.info(f"执行间隔任务: {func.__name__}")
             try:
@@ -70,8 +152,11 @@ class TaskScheduler:
             except Exception as e:
                 self.logger.error(f"间隔任务 {func.__name__} 执行失败: {e}")
         
-        job = schedule.every(interval_minutes).minutes.do(job_wrapper)
-        self.jobs.append(job)
+        self._add_job(
+            job_wrapper,
+            lambda: time.time() + interval_minutes * 60,
+            f"间隔任务 {func.__name__} every {interval_minutes} minutes"
+        )
         
         self.logger.info(f"已添加间隔任务: {func.__name__} every {interval_minutes} minutes")
     
@@ -91,19 +176,15 @@ class TaskScheduler:
             except Exception as e:
                 self.logger.error(f"每周任务 {func.__name__} 执行失败: {e}")
         
-        day_map = {
-            'monday': schedule.every().monday,
-            'tuesday': schedule.every().tuesday,
-            'wednesday': schedule.every().wednesday,
-            'thursday': schedule.every().thursday,
-            'friday': schedule.every().friday,
-            'saturday': schedule.every().saturday,
-            'sunday': schedule.every().sunday
-        }
-        
-        if day.lower() in day_map:
-            job = day_map[day.lower()].at(time_str).do(job_wrapper)
-            self.jobs.append(job)
+        if day.lower() in WEEKDAYS:
+            weekday = WEEKDAYS.index(day.lower())
+            hour, minute, second = _parse_time(time_str)
+            tz = self.timezone
+            self._add_job(
+                job_wrapper,
+                lambda: _next_fire_time(tz, hour, minute, second, weekday),
+                f"每周任务 {func.__name__} on {day} at {time_str} ({tz})"
+            )
             self.logger.info(f"已添加每周任务: {func.__name__} on {day} at {time_str}")
         else:
             self.logger.error(f"无效的星期: {day}")
@@ -148,13 +229,17 @@ class TaskScheduler:
         # 如果需要立即运行
         if run_immediately:
             self.logger.info("立即执行所有任务一次")
-            schedule.run_all()
+            for _, _, job_wrapper, _ in sorted(self._heap):
+                job_wrapper()
         
         # 主循环
+        self._stop.clear()
         try:
             while True:
-                schedule.run_pending()
-                time.sleep(60)  # 每分钟检查一次
+                self.run_pending()
+                if self._stop.wait(self._seconds_until_next_check()):
+                    break
+            self.logger.info("调度器已停止")
         except KeyboardInterrupt:
             self.logger.info("调度器已停止")
     
@@ -163,27 +248,61 @@ class TaskScheduler:
         启动调度器（非阻塞模式）
         在后台线程中运行
         """
-        import threading
-        
         def run_scheduler():
             self.logger.info("调度器在后台线程中启动")
             try:
                 while True:
-                    schedule.run_pending()
-                    time.sleep(60)
+                    self.run_pending()
+                    if self._stop.wait(self._seconds_until_next_check()):
+                        break
+                self.logger.info("后台调度器已停止")
             except Exception as e:
                 self.logger.error(f"调度器出错: {e}")
         
+        self._stop.clear()
+        
         thread = threading.Thread(target=run_scheduler, daemon=True)
         thread.start()
         self.logger.info("调度器已在后台启动")
     
+    def stop(self):
+        """
+        停止调度器
+        可在其他线程或信号处理函数中调用，主循环会立即从休眠中唤醒并退出
+        """
+        self._stop.set()
+    
+    def run_pending(self):
+        """
+        执行所有已到期的任务，并按各自的周期重新入堆
+        """
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, job_id, job_wrapper, next_fire = heapq.heappop(self._heap)
+            job_wrapper()
+            heapq.heappush(self._heap, (next_fire(), job_id, job_wrapper, next_fire))
+    
+    def _seconds_until_next_check(self) -> float:
+        """
+        计算主循环下次检查前的休眠时间
+        
+        直接休眠到堆顶任务的执行时间，但最长不超过60秒，
+        以便运行期间新加入的任务也能被及时调度。
+        
+        Returns:
+            float: 休眠秒数（0 ~ 60）
+        """
+        if not self._heap:
+            return 60.0
+        return min(max(0.0, self._heap[0][0] - time.time()), 60.0)
+    
     def print_schedule(self):
         """打印所有计划任务"""
         self.logger.info("=" * 50)
         self.logger.info("计划任务列表:")
-        for job in schedule.jobs:
-            self.logger.info(f"  - {job}")
+        for next_run, job_id, _, _ in sorted(self._heap):
+            next_run_time = datetime.fromtimestamp(next_run, self.timezone)
+            self.logger.info(f"  - {self.jobs[job_id]} (下次运行: {next_run_time:%Y-%m-%d %H:%M:%S %Z})")
         self.logger.info("=" * 50)
     
     def get_next_run_time(self) -> str:
@@ -193,12 +312,10 @@ class TaskScheduler:
         Returns:
             str: 下次运行时间的描述
         """
-        if not schedule.jobs:
+        if not self._heap:
             return "没有计划任务"
         
-        next_run = schedule.idle_seconds()
-        if next_run is None:
-            return "未知"
+        next_run = max(0.0, self._heap[0][0] - time.time())
         
         hours = int(next_run // 3600)
         minutes = int((next_run % 3600) // 60)
@@ -207,33 +324,65 @@ class TaskScheduler:
     
     def clear_all_jobs(self):
         """清除所有任务"""
-        schedule.clear()
+        self._heap = []
         self.jobs = []
         self.logger.info("已清除所有任务")
     
-    def is_market_hours(self, check_timezone: str = 'US/Eastern') -> bool:
+    def is_market_hours(self, check_timezone: str = 'US/Eastern', now: datetime = None) -> bool:
         """
         检查当前是否在交易时间内
         美股交易时间：周一至周五 09:30-16:00 ET
         
         Args:
             check_timezone: 检查的时区
+            now: 该时区的当前时间（可选，调用方已获取时传入，避免重复取时间）
         
         Returns:
             bool: 是否在交易时间
         """
-        tz = pytz.timezone(check_timezone)
-        now = datetime.now(tz)
+        # 同一分钟内结果不变，直接返回缓存
+        key = (check_timezone, int((time.time() if now is None else now.timestamp()) // 60))
+        cached = self._mh_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        if now is None:
+            now = _now(check_timezone)
         
         # 检查是否是工作日
         if now.weekday() >= 5:  # 周六(5)和周日(6)
-            return False
+            result = False
+        else:
+            # 检查时间
+            market_open, market_close = self._market_bounds(now, check_timezone)
+            result = market_open <= now <= market_close
         
-        # 检查时间
-        market_open = now.replace(hour=9, minute=30, second=0, microsecond=0)
-        market_close = now.replace(hour=16, minute=0, second=0, microsecond=0)
+        # 收盘所在的16:00这一分钟内结果会变化，不缓存
+        if not (now.hour == 16 and now.minute == 0):
+            self._mh_cache = {key: result}
         
-        return market_open <= now <= market_close
+        return result
+    
+    def _market_bounds(self, now: datetime, tz_name: str) -> tuple:
+        """
+        获取 now 所在日期的开盘、收盘时间（按日期和时区缓存，跨日时重新计算）
+        
+        Args:
+            now: 该时区的当前时间
+            tz_name: 时区名称
+        
+        Returns:
+            tuple: (开盘时间, 收盘时间)
+        """
+        cached_date, cached_tz, bounds = self._mkt_bounds_cache
+        today = now.date()
+        if cached_date != today or cached_tz != tz_name:
+            bounds = (
+                now.replace(hour=9, minute=30, second=0, microsecond=0),
+                now.replace(hour=16, minute=0, second=0, microsecond=0)
+            )
+            self._mkt_bounds_cache = (today, tz_name, bounds)
+        return bounds
     
     def wait_until_market_close(self, timezone: str = 'US/Eastern'):
         """
@@ -242,21 +391,20 @@ class TaskScheduler:
         Args:
             timezone: 时区
         """
-        tz = pytz.timezone(timezone)
-        now = datetime.now(tz)
+        now = _now(timezone)
         
         # 如果已经收盘或非交易日，直接返回
-        if not self.is_market_hours(timezone):
+        if not self.is_market_hours(timezone, now=now):
             self.logger.info("市场已收盘或非交易日")
             return
         
         # 计算到收盘的时间
-        market_close = now.replace(hour=16, minute=0, second=0, microsecond=0)
+        _, market_close = self._market_bounds(now, timezone)
         wait_seconds = (market_close - now).total_seconds()
         
         if wait_seconds > 0:
             self.logger.info(f"等待市场收盘，剩余 {wait_seconds/60:.1f} 分钟")
-            time.sleep(wait_seconds)
+            self._stop.wait(wait_seconds)
 
 
 class ScheduleConfig:
@@ -4,15 +4,39 @@ Scoring Engine - 综合评分引擎
 """
 
 import logging
+import warnings
+from collections import defaultdict, namedtuple
 from typing import Dict, List
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
 
+# 不同信号类型的加分权重，未列出的信号类型加 DEFAULT_SIGNAL_WEIGHT 分
+SIGNAL_WEIGHTS = {
+    '均线金叉': 30,
+    '价格突破': 35,
+    '成交量放大': 25,
+    'RSI超卖反弹': 20,
+    'RSI超买回落': 10
+}
+DEFAULT_SIGNAL_WEIGHT = 15
+
+# 多策略共振得分查找表：下标为信号数量（0/1/2/3个及以上），超出部分截断到最后一项
+_MS_LUT = np.array([0, 30, 70, 100], dtype=np.int16)
+
+# 综合得分的组成部分，顺序与权重向量一致
+SCORE_COMPONENTS = ('liquidity', 'trend', 'signal', 'multi_strategy')
+
+# 单条策略信号（评分过程中使用，输出结果时转换为dict）
+Signal = namedtuple('Signal', ['strategy', 'signal', 'price', 'details'])
+
+
 class ScoringEngine:
     """综合评分引擎"""
     
+    __slots__ = ('config', 'weights', 'output_count', 'logger')
+    
     def __init__(self, config: dict):
         """
         初始化综合评分引擎
@@ -58,40 +82,62 @@ class ScoringEngine:
         
         self.logger.info(f"共有 {len(ticker_signals)} 只股票触发了策略信号")
         
-        # 2. 为每只股票计算综合得分
-        all_scores = []
+        # 2. 所有股票的各项得分组成一张表，信号得分、共振得分、加权总分均按列批量计算
+        signal_scores = self._score_signals_batch(ticker_signals)
         
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        tickers = []
         for ticker in ticker_signals.keys():
             # 确保该股票有流动性和趋势得分
             if ticker not in liquidity_scores or ticker not in trend_scores:
-                self.logger.debug(f"{ticker}: 缺少流动性或趋势得分，跳过")
+                if debug_enabled:
+                    self.logger.debug(f"{ticker}: 缺少流动性或趋势得分，跳过")
                 continue
-            
-            score_result = self._calculate_final_score(
+            tickers.append(ticker)
+        
+        df = pd.DataFrame({
+            'liquidity': [liquidity_scores[t] for t in tickers],
+            'trend': [trend_scores[t]['total'] for t in tickers],
+            'signal': [signal_scores[t] for t in tickers],
+            'n_sigs': [len(ticker_signals[t]) for t in tickers],
+        }, index=tickers)
+        df['multi_strategy'] = _MS_LUT[np.minimum(df['n_sigs'].to_numpy(dtype=np.intp), len(_MS_LUT) - 1)]
+        
+        # 按列计算所有股票的加权总分（与逐只计算时的求和顺序一致）
+        raw_totals = self._weighted_total(
+            *(df[k].to_numpy(dtype=np.float64) for k in SCORE_COMPONENTS)
+        )
+        df['raw_total'] = raw_totals
+        # 按保留两位小数后的总分排名，同分时保持原有顺序
+        df['total'] = [round(x, 2) for x in raw_totals.tolist()]
+        
+        # 3-4. 按总分取Top N，只为入选的股票生成完整结果（共用同一个评分时间）
+        top = df.nlargest(self.output_count, 'total', keep='first')
+        timestamp = datetime.now().isoformat()
+        top_n = [
+            self._calculate_final_score(
                 ticker,
                 liquidity_scores[ticker],
                 trend_scores[ticker],
-                ticker_signals[ticker]
+                ticker_signals[ticker],
+                row.signal,
+                row.raw_total,
+                timestamp
             )
-            
-            all_scores.append(score_result)
-        
-        # 3. 按总分排序
-        all_scores.sort(key=lambda x: x['final_score']['total'], reverse=True)
-        
-        # 4. 取Top N
-        top_n = all_scores[:self.output_count]
+            for ticker, row in zip(top.index, top.itertuples(index=False))
+        ]
         
-        # 5. 添加排名和置信度
+        # 5. 添加排名和置信度，信号转换为dict输出
         for rank, item in enumerate(top_n, 1):
+            item['strategy_signals'] = [signal._asdict() for signal in item['strategy_signals']]
             item['final_score']['rank'] = rank
             item['final_score']['confidence'] = self._calculate_confidence(item)
         
-        self.logger.info(f"综合评分完成，共 {len(all_scores)} 只股票，输出Top {len(top_n)}")
+        self.logger.info(f"综合评分完成，共 {len(df)} 只股票，输出Top {len(top_n)}")
         
         return top_n
     
-    def _group_signals_by_ticker(self, strategy_results: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+    def _group_signals_by_ticker(self, strategy_results: Dict[str, List[Dict]]) -> Dict[str, List[Signal]]:
         """
         将策略信号按股票分组
         
@@ -99,30 +145,26 @@ class ScoringEngine:
             strategy_results: {strategy_name: [results]}
         
         Returns:
-            {ticker: [signals]}
+            {ticker: [Signal]}
         """
-        ticker_signals = {}
+        ticker_signals = defaultdict(list)
         
         for strategy_name, results in strategy_results.items():
             for result in results:
-                ticker = result['ticker']
-                if ticker not in ticker_signals:
-                    ticker_signals[ticker] = []
-                
-                ticker_signals[ticker].append({
-                    'strategy': strategy_name,
-                    'signal': result['signal'],
-                    'price': result['price'],
-                    'details': result.get('details', {})
-                })
-        
-        return ticker_signals
+                ticker_signals[result['ticker']].append(Signal(
+                    strategy_name, result['signal'], result['price'], result.get('details', {})
+                ))
+        
+        return dict(ticker_signals)
     
     def _calculate_final_score(self,
                                ticker: str,
                                liquidity_score: float,
                                trend_score: Dict,
-                               signals: List[Dict]) -> Dict:
+                               signals: List[Signal],
+                               signal_score: float = None,
+                               final_total: float = None,
+                               timestamp: str = None) -> Dict:
         """
         计算单只股票的最终得分
         
@@ -131,6 +173,9 @@ class ScoringEngine:
             liquidity_score: 流动性得分
             trend_score: 趋势得分字典
             signals: 策略信号列表
+            signal_score: 预先计算的信号得分（可选，未提供时根据signals计算）
+            final_total: 预先计算的加权总分（可选，未提供时单独计算）
+            timestamp: 评分时间（可选，未提供时取当前时间）
         
         Returns:
             完整的得分结果
@@ -142,24 +187,21 @@ class ScoringEngine:
         trend_total = trend_score['total']
         
         # 3. 策略信号得分 (0-100)
-        signal_score = self._score_signals(signals)
+        if signal_score is None:
+            signal_score = self._score_signals(signals)
         
         # 4. 多策略共振得分 (0-100)
         multi_strategy_score = self._score_multi_strategy(signals)
         
         # 加权总分
-        final_total = (
-            liq_score * self.weights['liquidity'] +
-            trend_total * self.weights['trend'] +
-            signal_score * self.weights['signal'] +
-            multi_strategy_score * self.weights['multi_strategy']
-        )
+        if final_total is None:
+            final_total = self._weighted_total(liq_score, trend_total, signal_score, multi_strategy_score)
         
         return {
             'ticker': ticker,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp or datetime.now().isoformat(),
             'basic_info': {
-                'price': signals[0]['price'] if signals else 0
+                'price': signals[0].price if signals else 0
             },
             'liquidity_score': round(liq_score, 2),
             'trend_score': trend_score,
@@ -177,7 +219,29 @@ class ScoringEngine:
             }
         }
     
-    def _score_signals(self, signals: List[Dict]) -> float:
+    def _weighted_total(self, liquidity, trend, signal, multi_strategy):
+        """
+        按固定顺序逐项累加加权得分（标量或numpy数组均可）
+        
+        保持与逐只计算时相同的浮点求和顺序，保证两位小数的总分结果一致
+        
+        Args:
+            liquidity: 流动性得分
+            trend: 趋势得分
+            signal: 策略信号得分
+            multi_strategy: 多策略共振得分
+        
+        Returns:
+            加权总分
+        """
+        return (
+            liquidity * self.weights['liquidity'] +
+            trend * self.weights['trend'] +
+            signal * self.weights['signal'] +
+            multi_strategy * self.weights['multi_strategy']
+        )
+    
+    def _score_signals(self, signals: List[Signal]) -> float:
         """
         评估策略信号强度 (0-100)
         
@@ -194,20 +258,7 @@ class ScoringEngine:
         base_score = 50
         
         # 根据信号类型加分
-        signal_types = [s['signal'] for s in signals]
-        
-        # 不同信号类型的权重
-        signal_weights = {
-            '均线金叉': 30,
-            '价格突破': 35,
-            '成交量放大': 25,
-            'RSI超卖反弹': 20,
-            'RSI超买回落': 10
-        }
-        
-        bonus = 0
-        for signal_type in signal_types:
-            bonus += signal_weights.get(signal_type, 15)
+        bonus = sum(SIGNAL_WEIGHTS.get(s.signal, DEFAULT_SIGNAL_WEIGHT) for s in signals)
         
         # 最多加50分
         bonus = min(bonus, 50)
@@ -215,7 +266,36 @@ class ScoringEngine:
         total = base_score + bonus
         return min(total, 100)
     
-    def _score_multi_strategy(self, signals: List[Dict]) -> float:
+    def _score_signals_batch(self, ticker_signals: Dict[str, List[Signal]]) -> Dict[str, float]:
+        """
+        批量评估所有股票的策略信号强度 (0-100)，与 _score_signals 结果一致
+        
+        Args:
+            ticker_signals: {ticker: [signals]}，每只股票至少有一个信号
+        
+        Returns:
+            {ticker: 信号得分}
+        """
+        tickers = list(ticker_signals.keys())
+        if not tickers:
+            return {}
+        
+        # 所有信号的权重展平为一个数组，按股票分段求和
+        counts = np.fromiter((len(ticker_signals[t]) for t in tickers), dtype=np.int64, count=len(tickers))
+        weights = np.fromiter(
+            (SIGNAL_WEIGHTS.get(s.signal, DEFAULT_SIGNAL_WEIGHT)
+             for t in tickers for s in ticker_signals[t]),
+            dtype=np.int64, count=int(counts.sum())
+        )
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        bonus = np.add.reduceat(weights, offsets)
+        
+        # 基础分50，最多加50分
+        scores = np.minimum(50 + np.minimum(bonus, 50), 100)
+        
+        return dict(zip(tickers, scores.tolist()))
+    
+    def _score_multi_strategy(self, signals: List[Signal]) -> float:
         """
         评估多策略共振 (0-100)
         
@@ -225,16 +305,8 @@ class ScoringEngine:
         Returns:
             共振得分
         """
-        num_strategies = len(signals)
-        
-        if num_strategies >= 3:
-            return 100  # 3个或以上策略共振
-        elif num_strategies == 2:
-            return 70   # 2个策略
-        elif num_strategies == 1:
-            return 30   # 单一策略
-        else:
-            return 0
+        # 3个或以上策略共振100分，2个策略70分，单一策略30分
+        return int(_MS_LUT[min(len(signals), len(_MS_LUT) - 1)])
     
     def _calculate_confidence(self, score_result: Dict) -> str:
         """
@@ -274,14 +346,20 @@ class ScoringEngine:
         try:
             # 计算平均成交额
             volume_period = config.get('volume_period', 20)
-            recent_data = df.tail(volume_period)
             
-            if len(recent_data) < volume_period:
+            if len(df) < volume_period:
                 return 50  # 数据不足，给中等分
             
-            avg_volume = recent_data['volume'].mean()
-            avg_price = recent_data['close'].mean()
-            avg_dollar_volume = avg_volume * avg_price
+            # 直接取最近 volume_period 天的numpy视图，不构造tail DataFrame
+            start = len(df) - volume_period
+            volume = df['volume'].to_numpy(dtype=np.float64)[start:]
+            close = df['close'].to_numpy(dtype=np.float64)[start:]
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                # 与pandas的mean一致，忽略NaN
+                avg_volume = np.nanmean(volume)
+                avg_price = np.nanmean(close)
+            avg_dollar_volume = float(avg_volume * avg_price)
             
             # 基准值（超过这个值得满分）
             excellent_threshold = config.get('excellent_threshold', 10000000)  # 1000万美元
@@ -301,11 +379,62 @@ class ScoringEngine:
         except Exception as e:
             self.logger.error(f"计算流动性得分时出错: {e}")
             return 50
-
-
-
-
-
-
-
+    
+    def calculate_liquidity_scores(self, data: Dict[str, pd.DataFrame], config: dict) -> Dict[str, float]:
+        """
+        批量计算流动性得分 (0-100)，与逐只调用 calculate_liquidity_score 结果一致
+        
+        将所有股票最近 volume_period 天的收盘价/成交量堆叠为二维数组，一次性按行求均值。
+        
+        Args:
+            data: 股票数据字典 {ticker: dataframe}
+            config: 流动性配置
+        
+        Returns:
+            {ticker: 流动性得分}
+        """
+        volume_period = config.get('volume_period', 20)
+        excellent_threshold = config.get('excellent_threshold', 10000000)  # 1000万美元
+        min_threshold = config.get('min_avg_dollar_volume', 1000000)  # 100万美元
+        
+        scores = {}
+        tickers, closes, volumes = [], [], []
+        for ticker, df in data.items():
+            try:
+                if len(df) < volume_period:
+                    scores[ticker] = 50  # 数据不足，给中等分
+                    continue
+                # 与 calculate_liquidity_score 相同的起始位置（volume_period 为0时各股票均为空窗口）
+                start = len(df) - volume_period
+                close = df['close'].to_numpy(dtype=np.float64)[start:]
+                volume = df['volume'].to_numpy(dtype=np.float64)[start:]
+            except Exception as e:
+                self.logger.error(f"计算流动性得分时出错: {e}")
+                scores[ticker] = 50
+                continue
+            tickers.append(ticker)
+            closes.append(close)
+            volumes.append(volume)
+        
+        if tickers:
+            with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                # 与pandas的mean一致，忽略NaN
+                avg_dollar_volume = (np.nanmean(np.stack(volumes), axis=1) *
+                                     np.nanmean(np.stack(closes), axis=1))
+                
+                score = np.where(
+                    avg_dollar_volume >= excellent_threshold,
+                    100.0,
+                    np.where(
+                        avg_dollar_volume >= min_threshold,
+                        # 线性插值
+                        60 + 40 * (avg_dollar_volume - min_threshold) / (excellent_threshold - min_threshold),
+                        # 低于门槛，得分很低（不应该出现，因为过滤器会拦截）
+                        50 * (avg_dollar_volume / min_threshold)
+                    )
+                )
+            scores.update(zip(tickers, np.minimum(score, 100).tolist()))
+        
+        return {ticker: scores[ticker] for ticker in data}
 
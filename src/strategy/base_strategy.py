@@ -3,35 +3,62 @@ Base Strategy - 策略基类
 定义统一的策略接口
 """
 
-from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+import os
+from abc import ABC
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Dict, Optional, Union
+import numpy as np
 import pandas as pd
 import logging
 
 
+# 默认scan实现中每个任务处理的股票数，减少线程池/进程池调度与IPC开销
+SCAN_BATCH_SIZE = 64
+
+# scan 可选的执行器类型（配置项 executor）
+SCAN_EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor
+}
+
+
 class BaseStrategy(ABC):
     """
     策略基类
-    所有策略都应继承此类并实现scan方法
+    所有策略都应继承此类并实现scan_one方法（逐只筛选）或scan方法（整体筛选）
+    
+    使用 __slots__ 存放实例属性；子类未声明 __slots__ 时仍可自由添加属性，
+    子类声明了 __slots__ 时必须列出自己新增的全部属性
     """
     
-    def __init__(self, name: str, config: Optional[Dict] = None):
+    __slots__ = ('name', 'config', 'logger', '_req_cols')
+    
+    def __init__(self, name: str, config: Optional[Dict] = None,
+                 required_columns: Optional[List[str]] = None):
         """
         初始化策略
         
         Args:
             name: 策略名称
             config: 策略配置参数
+            required_columns: 策略必需的列名列表（validate_data 的默认检查项）
         """
         self.name = name
         self.config = config or {}
         self.logger = logging.getLogger(f"{__name__}.{name}")
+        # 预先构造为frozenset，避免每只股票校验时重复建集合
+        self._req_cols = frozenset(required_columns or ())
     
-    @abstractmethod
     def scan(self, data: Dict[str, pd.DataFrame]) -> List[Dict]:
         """
         执行股票筛选
         
+        默认实现将股票按 SCAN_BATCH_SIZE 分批，在线程池中对每只股票调用 scan_one，
+        结果按输入顺序返回。线程数由配置项 max_workers 控制（默认CPU核数，<=1 时顺序执行）。
+        配置项 executor 为 'process' 时改用进程池，适合CPU密集的策略；此时只把
+        scan_window() 指定的最后若干行数据传给子进程，以减少序列化开销。
+        子类可以只实现 scan_one，也可以覆盖本方法做整体的向量化筛选。
+        
         Args:
             data: 股票数据字典 {ticker: dataframe}
         
@@ -42,7 +69,105 @@ class BaseStrategy(ABC):
                 - price: 当前价格
                 - details: 详细信息（可选）
         """
-        pass
+        # 先剔除数据不足或缺列的股票，不必为它们调度任务或序列化数据
+        window = self.scan_window()
+        items = self.prefilter(data, min_rows=window or 1)
+        max_workers = self.get_config_value('max_workers', os.cpu_count() or 1)
+        executor_type = self.get_config_value('executor', 'thread')
+        executor_cls = SCAN_EXECUTORS.get(executor_type)
+        if executor_cls is None:
+            self.logger.warning(f"未知的执行器类型: {executor_type}，使用线程池")
+            executor_cls = ThreadPoolExecutor
+        
+        if executor_cls is ProcessPoolExecutor:
+            if window:
+                items = [(ticker, df.tail(window) if isinstance(df, pd.DataFrame) else df)
+                         for ticker, df in items]
+        
+        batches = [items[i:i + SCAN_BATCH_SIZE] for i in range(0, len(items), SCAN_BATCH_SIZE)]
+        if max_workers <= 1 or len(batches) <= 1:
+            return self._scan_batch(items)
+        
+        results = []
+        with executor_cls(max_workers=min(max_workers, len(batches))) as executor:
+            for batch_results in executor.map(self._scan_batch, batches):
+                results.extend(batch_results)
+        return results
+    
+    def prefilter(self, data: Dict[str, pd.DataFrame], min_rows: int = 1,
+                  columns: tuple = ()) -> List[tuple]:
+        """
+        一次性筛出数据行数足够且包含必需列的股票
+        
+        Args:
+            data: 股票数据字典 {ticker: dataframe}
+            min_rows: 至少需要的行数
+            columns: 除初始化时指定的必需列外还需要的列
+        
+        Returns:
+            List[tuple]: 通过检查的 [(ticker, dataframe)]，保持输入顺序
+        """
+        req_cols = self._req_cols.union(columns) if columns else self._req_cols
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        
+        items = []
+        for ticker, df in data.items():
+            if df is None or len(df) < min_rows:
+                continue
+            if not req_cols.issubset(df.columns):
+                if debug_enabled:
+                    self.logger.debug(f"{ticker}: 缺少必需的列: {set(req_cols.difference(df.columns))}")
+                continue
+            items.append((ticker, df))
+        return items
+    
+    def scan_window(self) -> Optional[int]:
+        """
+        scan_one 需要的最少行数（从最新一行往前数）
+        
+        默认 scan 会先跳过行数不足的股票；使用进程池时只传递这部分数据给子进程。
+        返回None表示需要完整数据。
+        
+        Returns:
+            int: 行数，或None
+        """
+        return None
+    
+    def scan_one(self, ticker: str, df: pd.DataFrame) -> Optional[Dict]:
+        """
+        筛选单只股票
+        
+        Args:
+            ticker: 股票代码
+            df: 该股票的数据
+        
+        Returns:
+            Dict: 符合条件时返回结果字典（格式同 scan），否则返回None
+        """
+        raise NotImplementedError(f"{type(self).__name__} 需要实现 scan 或 scan_one 方法")
+    
+    def _scan_batch(self, items: List[tuple]) -> List[Dict]:
+        """
+        顺序筛选一批股票，单只股票出错时记录日志并跳过
+        
+        Args:
+            items: [(ticker, dataframe)] 列表
+        
+        Returns:
+            List[Dict]: 该批股票中符合条件的结果
+        """
+        results = []
+        for ticker, df in items:
+            try:
+                result = self.scan_one(ticker, df)
+            except NotImplementedError:
+                raise
+            except Exception as e:
+                self.logger.error("处理 %s 时出错: %s", ticker, e)
+                continue
+            if result is not None:
+                results.append(result)
+        return results
     
     def get_latest_row(self, df: pd.DataFrame) -> Optional[pd.Series]:
         """
@@ -73,13 +198,32 @@ class BaseStrategy(ABC):
             return None
         return df.iloc[-(offset + 1)]
     
-    def validate_data(self, df: pd.DataFrame, required_columns: List[str]) -> bool:
+    def get_latest_array(self, df: pd.DataFrame, columns: List[str], rows: int = 1) -> Optional[np.ndarray]:
+        """
+        以numpy数组获取指定列最后几行的数据
+        
+        直接读取各列底层数组的末尾，不构造pandas行Series，适合逐只股票扫描的热点路径。
+        
+        Args:
+            df: 数据DataFrame
+            columns: 列名列表
+            rows: 行数（2表示前一行和最新一行）
+        
+        Returns:
+            np.ndarray: 形状为 (rows, len(columns)) 的数组，按时间顺序排列；数据不足时返回None
+        """
+        if df is None or len(df) < rows:
+            return None
+        start = len(df) - rows
+        return np.column_stack([df[col].to_numpy()[start:] for col in columns])
+    
+    def validate_data(self, df: pd.DataFrame, required_columns: Optional[List[str]] = None) -> bool:
         """
         验证数据是否包含必需的列
         
         Args:
             df: 要验证的DataFrame
-            required_columns: 必需的列名列表
+            required_columns: 必需的列名列表（可选，默认使用初始化时指定的列）
         
         Returns:
             bool: 是否有效
@@ -87,23 +231,27 @@ class BaseStrategy(ABC):
         if df is None or df.empty:
             return False
         
-        missing_columns = set(required_columns) - set(df.columns)
-        if missing_columns:
-            self.logger.debug(f"缺少必需的列: {missing_columns}")
+        req_cols = self._req_cols if required_columns is None else frozenset(required_columns)
+        if not req_cols.issubset(df.columns):
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"缺少必需的列: {set(req_cols.difference(df.columns))}")
             return False
         
         return True
     
-    def log_signal(self, ticker: str, signal_type: str, details: str = ""):
+    def log_signal(self, ticker: str, signal_type: str, details: Union[str, Dict] = ""):
         """
         记录信号日志
         
         Args:
             ticker: 股票代码
             signal_type: 信号类型
-            details: 详细信息
+            details: 详细信息（字符串或dict，dict在写日志时才格式化）
         """
-        self.logger.info(f"[{self.name}] {ticker} - {signal_type} {details}")
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        # 参数交给logging延迟格式化，只在真正输出时才把details转成字符串
+        self.logger.info("[%s] %s - %s %s", self.name, ticker, signal_type, details)
     
     def get_config_value(self, key: str, default=None):
         """
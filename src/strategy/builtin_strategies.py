@@ -3,19 +3,36 @@ Builtin Strategies - 内置策略
 提供常用的选股策略示例
 """
 
-from typing import List, Dict
+import logging
+from typing import List, Dict, Optional
 import pandas as pd
 import numpy as np
 
 from .base_strategy import BaseStrategy
 
 
+def _nanmax(values: np.ndarray) -> float:
+    """
+    忽略NaN的最大值，与pandas的Series.max一致：空数组或全为NaN时返回NaN
+    
+    Args:
+        values: 数值数组
+    
+    Returns:
+        float: 最大值
+    """
+    values = values[~np.isnan(values)] if values.dtype.kind == 'f' else values
+    return values.max() if values.size else np.nan
+
+
 class MACrossoverStrategy(BaseStrategy):
     """
     均线交叉策略
     当短期均线向上突破长期均线时产生买入信号
     """
     
+    __slots__ = ()
+    
     def __init__(self, config: Dict = None):
         default_config = {
             'short_period': 20,
@@ -25,82 +42,82 @@ class MACrossoverStrategy(BaseStrategy):
         if config:
             default_config.update(config)
         
-        super().__init__("MA_Crossover", default_config)
+        super().__init__("MA_Crossover", default_config, required_columns=['close', 'volume'])
     
     def scan(self, data: Dict[str, pd.DataFrame]) -> List[Dict]:
         """
         扫描均线交叉信号
-        """
-        results = []
         
+        将所有股票最后两行的均线/收盘价堆叠为 (N, 2, 3) 数组，一次比较得出所有金叉，
+        只为触发信号的股票构造结果。scan_one 也通过本方法判断单只股票。
+        """
         short_period = self.get_config_value('short_period', 20)
         long_period = self.get_config_value('long_period', 50)
         volume_confirm = self.get_config_value('volume_confirm', True)
+        short_ma_col = f'sma_{short_period}'
+        long_ma_col = f'sma_{long_period}'
         
-        for ticker, df in data.items():
-            # 验证数据
-            required_cols = ['close', 'volume']
-            if not self.validate_data(df, required_cols):
+        tickers, tails, volume_ratios, has_volume_ratio = [], [], [], []
+        # 先一次性剔除数据不足或缺少均线的股票，循环内只剩读取数据
+        for ticker, df in self.prefilter(data, long_period + 1, (short_ma_col, long_ma_col)):
+            try:
+                tail = self.get_latest_array(df, [short_ma_col, long_ma_col, 'close'], rows=2).astype(np.float64)
+                has_vr = 'volume_ratio' in df.columns
+                volume_ratio = float(df['volume_ratio'].to_numpy()[-1]) if has_vr else np.nan
+            except Exception as e:
+                self.logger.error("处理 %s 时出错: %s", ticker, e)
                 continue
             
-            # 确保有足够的数据
-            if len(df) < long_period + 1:
-                continue
+            tickers.append(ticker)
+            tails.append(tail)
+            volume_ratios.append(volume_ratio)
+            has_volume_ratio.append(has_vr)
+        
+        if not tickers:
+            return []
+        
+        tail2 = np.stack(tails)
+        prev, curr = tail2[:, 0, :], tail2[:, 1, :]
+        volume_ratios = np.array(volume_ratios, dtype=np.float64)
+        has_volume_ratio = np.array(has_volume_ratio, dtype=bool)
+        
+        # 金叉：前一天短均线在下方，今天短均线在上方
+        mask = (prev[:, 0] <= prev[:, 1]) & (curr[:, 0] > curr[:, 1])
+        # 成交量确认
+        if volume_confirm:
+            mask &= ~(has_volume_ratio & (volume_ratios < 1.0))
+        
+        results = []
+        log_enabled = self.logger.isEnabledFor(logging.INFO)
+        for i in np.flatnonzero(mask):
+            ticker = tickers[i]
+            short_ma_now, long_ma_now, price = curr[i]
+            details = {
+                'short_ma': round(short_ma_now, 2),
+                'long_ma': round(long_ma_now, 2),
+                'volume_ratio': round(volume_ratios[i], 2) if has_volume_ratio[i] else 0
+            }
             
-            try:
-                # 计算均线
-                short_ma_col = f'sma_{short_period}'
-                long_ma_col = f'sma_{long_period}'
-                
-                if short_ma_col not in df.columns or long_ma_col not in df.columns:
-                    self.logger.debug(f"{ticker}: 缺少均线数据")
-                    continue
-                
-                # 获取最新和前一天的数据
-                latest = self.get_latest_row(df)
-                previous = self.get_previous_row(df)
-                
-                if latest is None or previous is None:
-                    continue
-                
-                # 检测金叉：短均线从下方穿过长均线
-                short_ma_now = latest[short_ma_col]
-                long_ma_now = latest[long_ma_col]
-                short_ma_prev = previous[short_ma_col]
-                long_ma_prev = previous[long_ma_col]
-                
-                # 判断是否发生金叉
-                golden_cross = (
-                    short_ma_prev <= long_ma_prev and  # 前一天短均线在下方
-                    short_ma_now > long_ma_now          # 今天短均线在上方
-                )
-                
-                if golden_cross:
-                    # 如果需要成交量确认
-                    if volume_confirm and 'volume_ratio' in df.columns:
-                        if latest['volume_ratio'] < 1.0:
-                            continue
-                    
-                    price = latest['close']
-                    details = {
-                        'short_ma': round(short_ma_now, 2),
-                        'long_ma': round(long_ma_now, 2),
-                        'volume_ratio': round(latest.get('volume_ratio', 0), 2)
-                    }
-                    
-                    results.append({
-                        'ticker': ticker,
-                        'signal': '均线金叉',
-                        'price': round(price, 2),
-                        'details': details
-                    })
-                    
-                    self.log_signal(ticker, '均线金叉', str(details))
-                    
-            except Exception as e:
-                self.logger.error(f"处理 {ticker} 时出错: {e}")
+            results.append({
+                'ticker': ticker,
+                'signal': '均线金叉',
+                'price': round(price, 2),
+                'details': details
+            })
+            
+            if log_enabled:
+                self.log_signal(ticker, '均线金叉', details)
         
         return results
+    
+    def scan_one(self, ticker: str, df: pd.DataFrame) -> Optional[Dict]:
+        """
+        扫描均线交叉信号（单只股票）
+        
+        复用 scan 的向量化判断，保证两条路径结果一致
+        """
+        results = self.scan({ticker: df})
+        return results[0] if results else None
 
 
 class VolumeSurgeStrategy(BaseStrategy):
@@ -109,6 +126,8 @@ class VolumeSurgeStrategy(BaseStrategy):
     检测成交量异常放大且价格上涨的股票
     """
     
+    __slots__ = ()
+    
     def __init__(self, config: Dict = None):
         default_config = {
             'lookback_period': 20,
@@ -118,60 +137,50 @@ class VolumeSurgeStrategy(BaseStrategy):
         if config:
             default_config.update(config)
         
-        super().__init__("Volume_Surge", default_config)
+        super().__init__("Volume_Surge", default_config, required_columns=['close', 'volume'])
     
-    def scan(self, data: Dict[str, pd.DataFrame]) -> List[Dict]:
+    def scan_window(self) -> Optional[int]:
+        """只需要最新一行"""
+        return 1
+    
+    def scan_one(self, ticker: str, df: pd.DataFrame) -> Optional[Dict]:
         """
         扫描成交量异常信号
         """
-        results = []
-        
         surge_multiplier = self.get_config_value('surge_multiplier', 2.0)
         min_price_change = self.get_config_value('min_price_change', 2.0)
         
-        for ticker, df in data.items():
-            required_cols = ['close', 'volume']
-            if not self.validate_data(df, required_cols):
-                continue
-            
-            try:
-                latest = self.get_latest_row(df)
-                if latest is None:
-                    continue
-                
-                # 检查是否有成交量比率数据
-                if 'volume_ratio' not in df.columns:
-                    continue
-                
-                volume_ratio = latest['volume_ratio']
-                
-                # 成交量放大
-                if volume_ratio >= surge_multiplier:
-                    # 检查价格变化
-                    if 'price_change_1d' in df.columns:
-                        price_change = latest['price_change_1d']
-                        
-                        # 价格上涨
-                        if price_change >= min_price_change:
-                            details = {
-                                'volume_ratio': round(volume_ratio, 2),
-                                'price_change': round(price_change, 2),
-                                'volume': int(latest['volume'])
-                            }
-                            
-                            results.append({
-                                'ticker': ticker,
-                                'signal': '成交量放大',
-                                'price': round(latest['close'], 2),
-                                'details': details
-                            })
-                            
-                            self.log_signal(ticker, '成交量放大', str(details))
-                            
-            except Exception as e:
-                self.logger.error(f"处理 {ticker} 时出错: {e}")
+        if not self.validate_data(df):
+            return None
         
-        return results
+        # 检查是否有成交量比率和涨跌幅数据
+        if 'volume_ratio' not in df.columns or 'price_change_1d' not in df.columns:
+            return None
+        
+        values = self.get_latest_array(df, ['volume_ratio', 'price_change_1d', 'close', 'volume'])
+        if values is None:
+            return None
+        
+        volume_ratio, price_change, close, volume = values[-1]
+        
+        # 成交量放大且价格上涨（任一数值为NaN时不触发）
+        if not (volume_ratio >= surge_multiplier and price_change >= min_price_change):
+            return None
+        
+        details = {
+            'volume_ratio': round(volume_ratio, 2),
+            'price_change': round(price_change, 2),
+            'volume': int(volume)
+        }
+        
+        self.log_signal(ticker, '成交量放大', details)
+        
+        return {
+            'ticker': ticker,
+            'signal': '成交量放大',
+            'price': round(close, 2),
+            'details': details
+        }
 
 
 class BreakoutStrategy(BaseStrategy):
@@ -180,6 +189,8 @@ class BreakoutStrategy(BaseStrategy):
     检测价格突破近期高点的股票
     """
     
+    __slots__ = ()
+    
     def __init__(self, config: Dict = None):
         default_config = {
             'lookback_period': 20,
@@ -189,63 +200,63 @@ class BreakoutStrategy(BaseStrategy):
         if config:
             default_config.update(config)
         
-        super().__init__("Breakout", default_config)
+        super().__init__("Breakout", default_config, required_columns=['close', 'high', 'volume'])
     
-    def scan(self, data: Dict[str, pd.DataFrame]) -> List[Dict]:
+    def scan_window(self) -> Optional[int]:
+        """需要最新一行及之前 lookback_period 天的数据"""
+        return self.get_config_value('lookback_period', 20) + 1
+    
+    def scan_one(self, ticker: str, df: pd.DataFrame) -> Optional[Dict]:
         """
         扫描突破信号
         """
-        results = []
-        
         lookback_period = self.get_config_value('lookback_period', 20)
         volume_confirm = self.get_config_value('volume_confirm', True)
         min_volume_ratio = self.get_config_value('min_volume_ratio', 1.2)
         
-        for ticker, df in data.items():
-            required_cols = ['close', 'high', 'volume']
-            if not self.validate_data(df, required_cols):
-                continue
-            
-            if len(df) < lookback_period + 1:
-                continue
-            
-            try:
-                latest = self.get_latest_row(df)
-                if latest is None:
-                    continue
-                
-                # 计算前N天的最高价（不包括今天）
-                recent_high = df['high'].iloc[-(lookback_period+1):-1].max()
-                current_close = latest['close']
-                
-                # 检测突破
-                if current_close > recent_high:
-                    # 成交量确认
-                    if volume_confirm and 'volume_ratio' in df.columns:
-                        if latest['volume_ratio'] < min_volume_ratio:
-                            continue
-                    
-                    breakout_pct = ((current_close - recent_high) / recent_high) * 100
-                    
-                    details = {
-                        'recent_high': round(recent_high, 2),
-                        'breakout_pct': round(breakout_pct, 2),
-                        'volume_ratio': round(latest.get('volume_ratio', 0), 2)
-                    }
-                    
-                    results.append({
-                        'ticker': ticker,
-                        'signal': '价格突破',
-                        'price': round(current_close, 2),
-                        'details': details
-                    })
-                    
-                    self.log_signal(ticker, '价格突破', str(details))
-                    
-            except Exception as e:
-                self.logger.error(f"处理 {ticker} 时出错: {e}")
+        if not self.validate_data(df):
+            return None
         
-        return results
+        if len(df) < lookback_period + 1:
+            return None
+        
+        has_volume_ratio = 'volume_ratio' in df.columns
+        columns = ['close', 'volume_ratio'] if has_volume_ratio else ['close']
+        values = self.get_latest_array(df, columns)
+        if values is None:
+            return None
+        
+        current_close = values[-1, 0]
+        volume_ratio = values[-1, 1] if has_volume_ratio else 0
+        
+        # 成交量确认：先于计算近期高点排除量能不足的股票
+        if volume_confirm and has_volume_ratio:
+            if volume_ratio < min_volume_ratio:
+                return None
+        
+        # 计算前N天的最高价（不包括今天），直接在底层数组上切片
+        recent_high = _nanmax(df['high'].to_numpy()[-(lookback_period+1):-1])
+        
+        # 检测突破
+        if not current_close > recent_high:
+            return None
+        
+        breakout_pct = ((current_close - recent_high) / recent_high) * 100
+        
+        details = {
+            'recent_high': round(recent_high, 2),
+            'breakout_pct': round(breakout_pct, 2),
+            'volume_ratio': round(volume_ratio, 2)
+        }
+        
+        self.log_signal(ticker, '价格突破', details)
+        
+        return {
+            'ticker': ticker,
+            'signal': '价格突破',
+            'price': round(current_close, 2),
+            'details': details
+        }
 
 
 class RSIStrategy(BaseStrategy):
@@ -254,6 +265,8 @@ class RSIStrategy(BaseStrategy):
     检测超卖反弹机会
     """
     
+    __slots__ = ()
+    
     def __init__(self, config: Dict = None):
         default_config = {
             'oversold_threshold': 30,
@@ -263,68 +276,77 @@ class RSIStrategy(BaseStrategy):
         if config:
             default_config.update(config)
         
-        super().__init__("RSI", default_config)
+        super().__init__("RSI", default_config, required_columns=['close', 'rsi'])
     
     def scan(self, data: Dict[str, pd.DataFrame]) -> List[Dict]:
         """
         扫描RSI信号
-        """
-        results = []
         
+        将所有股票最后两行的RSI/收盘价堆叠为 (N, 2, 2) 数组，一次比较得出所有穿越信号，
+        只为触发信号的股票构造结果。scan_one 也通过本方法判断单只股票。
+        """
         oversold_threshold = self.get_config_value('oversold_threshold', 30)
         overbought_threshold = self.get_config_value('overbought_threshold', 70)
         mode = self.get_config_value('mode', 'oversold')
         
-        for ticker, df in data.items():
-            required_cols = ['close', 'rsi']
-            if not self.validate_data(df, required_cols):
-                continue
-            
+        if mode == 'oversold':
+            signal_type = "RSI超卖反弹"
+        elif mode == 'overbought':
+            signal_type = "RSI超买回落"
+        else:
+            return []
+        
+        tickers, tails = [], []
+        for ticker, df in self.prefilter(data, 2):
             try:
-                latest = self.get_latest_row(df)
-                previous = self.get_previous_row(df)
-                
-                if latest is None or previous is None:
-                    continue
-                
-                rsi_now = latest['rsi']
-                rsi_prev = previous['rsi']
-                
-                if pd.isna(rsi_now) or pd.isna(rsi_prev):
-                    continue
-                
-                signal_detected = False
-                signal_type = ""
-                
-                # 超卖反弹
-                if mode == 'oversold':
-                    if rsi_prev <= oversold_threshold and rsi_now > oversold_threshold:
-                        signal_detected = True
-                        signal_type = "RSI超卖反弹"
-                
-                # 超买回落
-                elif mode == 'overbought':
-                    if rsi_prev >= overbought_threshold and rsi_now < overbought_threshold:
-                        signal_detected = True
-                        signal_type = "RSI超买回落"
-                
-                if signal_detected:
-                    details = {
-                        'rsi': round(rsi_now, 2),
-                        'rsi_prev': round(rsi_prev, 2)
-                    }
-                    
-                    results.append({
-                        'ticker': ticker,
-                        'signal': signal_type,
-                        'price': round(latest['close'], 2),
-                        'details': details
-                    })
-                    
-                    self.log_signal(ticker, signal_type, str(details))
-                    
+                tail = self.get_latest_array(df, ['rsi', 'close'], rows=2).astype(np.float64)
             except Exception as e:
-                self.logger.error(f"处理 {ticker} 时出错: {e}")
+                self.logger.error("处理 %s 时出错: %s", ticker, e)
+                continue
+            tickers.append(ticker)
+            tails.append(tail)
+        
+        if not tickers:
+            return []
+        
+        tail2 = np.stack(tails)
+        rsi_prev, rsi_now = tail2[:, 0, 0], tail2[:, 1, 0]
+        
+        # NaN参与的比较均为False，不会触发信号
+        if mode == 'oversold':
+            # 超卖反弹
+            mask = (rsi_prev <= oversold_threshold) & (rsi_now > oversold_threshold)
+        else:
+            # 超买回落
+            mask = (rsi_prev >= overbought_threshold) & (rsi_now < overbought_threshold)
+        
+        results = []
+        log_enabled = self.logger.isEnabledFor(logging.INFO)
+        for i in np.flatnonzero(mask):
+            ticker = tickers[i]
+            details = {
+                'rsi': round(rsi_now[i], 2),
+                'rsi_prev': round(rsi_prev[i], 2)
+            }
+            
+            results.append({
+                'ticker': ticker,
+                'signal': signal_type,
+                'price': round(tail2[i, 1, 1], 2),
+                'details': details
+            })
+            
+            if log_enabled:
+                self.log_signal(ticker, signal_type, details)
         
         return results
+    
+    def scan_one(self, ticker: str, df: pd.DataFrame) -> Optional[Dict]:
+        """
+        扫描RSI信号（单只股票）
+        
+        复用 scan 的向量化判断，保证两条路径结果一致
+        """
+        results = self.scan({ticker: df})
+        return results[0] if results else None
 
@@ -15,7 +15,7 @@ class CustomStrategy(BaseStrategy):
     
     使用方法:
     1. 继承BaseStrategy类
-    2. 实现scan方法
+    2. 实现scan_one方法（逐只筛选，默认由基类并行调度）或scan方法（整体筛选）
     3. 在配置文件中启用该策略
     
     示例：
@@ -4,7 +4,7 @@ Base Trend Scorer - 趋势评分器基类
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Dict, Sequence
 import pandas as pd
 import logging
 
@@ -44,13 +44,25 @@ class BaseTrendScorer(ABC):
         """
         pass
     
+    def score_batch(self, data: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+        """
+        批量计算趋势得分（默认逐只调用score，子类可覆盖为向量化实现）
+        
+        Args:
+            data: 股票数据字典 {ticker: dataframe}
+        
+        Returns:
+            Dict[str, Dict]: {ticker: 评分结果}
+        """
+        return {ticker: self.score(df) for ticker, df in data.items()}
+    
     @abstractmethod
-    def get_required_indicators(self) -> List[str]:
+    def get_required_indicators(self) -> Sequence[str]:
         """
         返回需要的技术指标列表
         
         Returns:
-            List[str]: 指标名称列表
+            Sequence[str]: 指标名称序列（可以是类级常量元组，调用方不应修改）
         """
         pass
     
@@ -3,11 +3,168 @@ MA ADX Scorer - 均线+ADX趋势评分器
 """
 
 from .base_scorer import BaseTrendScorer
+from ..indicators_kernels import njit
+import warnings
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import numpy as np
 
 
+# 价格位置评分使用的回看天数
+POSITION_LOOKBACK = 20
+
+# 各评分项的状态码 -> 状态名（状态码由 _ma_adx_kernel 返回，-1 表示数据缺失）
+MA_STATUS = ('no_alignment', 'weak_bullish', 'moderate_bullish', 'strong_bullish', 'perfect_bullish')
+ADX_STATUS = ('downtrend', 'strong_uptrend', 'very_strong_uptrend', 'overheated', 'forming_uptrend', 'weak_trend')
+MOMENTUM_STATUS = ('strong_momentum', 'good_momentum', 'moderate_momentum', 'weak_momentum', 'negative_momentum')
+POSITION_STATUS = ('ideal_position', 'high_position', 'mid_position', 'too_high', 'low_position',
+                   'insufficient_data', 'flat')
+
+# score_batch 的分档查找表：区间下标 = searchsorted(左闭边界, side='right') + searchsorted(右闭边界, side='left')
+# ADX: [<20, 20~25, 25~40, 40~50, >50]，25<=adx<=40 两端都包含
+ADX_LEFT_BINS = np.array([20.0, 25.0])
+ADX_RIGHT_BINS = np.array([40.0, 50.0])
+ADX_SCORES = np.array([30.0, 60.0, 100.0, 70.0, 50.0])
+ADX_CODES = np.array([5, 4, 1, 2, 3])
+# 5日涨幅(%): [<0, 0~2, 2~5, 5~10, >=10]
+MOMENTUM_BINS = np.array([0.0, 2.0, 5.0, 10.0])
+MOMENTUM_SCORES = np.array([0.0, 30.0, 50.0, 70.0, 100.0])
+MOMENTUM_CODES = np.array([4, 3, 2, 1, 0])
+# 相对位置: [<0.3, 0.3~0.5, 0.5~0.75, 0.75~0.85, >0.85]，0.5<=position<=0.75 两端都包含
+POSITION_LEFT_BINS = np.array([0.3, 0.5])
+POSITION_RIGHT_BINS = np.array([0.75, 0.85])
+POSITION_SCORES = np.array([20.0, 60.0, 100.0, 80.0, 30.0])
+POSITION_CODES = np.array([4, 2, 0, 1, 3])
+
+
+@njit(cache=True, error_model='numpy')
+def _ma_adx_kernel(vec: np.ndarray, high_tail: np.ndarray, low_tail: np.ndarray, weights: np.ndarray):
+    """
+    计算单只股票的四项趋势得分及加权总分
+
+    Args:
+        vec: float64数组 [close, sma_5, sma_10, sma_20, sma_50, adx, plus_di, minus_di, price_change_5d]
+        high_tail: 最近 POSITION_LOOKBACK 天的最高价（不足时为全部数据）
+        low_tail: 最近 POSITION_LOOKBACK 天的最低价
+        weights: 权重 [ma_alignment, adx_strength, price_momentum, price_position]
+
+    Returns:
+        tuple: (总分, 均线得分, ADX得分, 动量得分, 位置得分,
+                均线状态码, 多头排列数, ADX状态码, 动量状态码, 位置状态码, 相对位置, 20日最高, 20日最低)
+    """
+    close = vec[0]
+    ma5, ma10, ma20, ma50 = vec[1], vec[2], vec[3], vec[4]
+    adx, plus_di, minus_di = vec[5], vec[6], vec[7]
+    return_5d = vec[8]
+
+    # NaN判断使用 x != x：JIT下为单条浮点比较，未安装numba时也避免np.isnan的调用开销
+    # 1. 均线排列
+    alignment_count = 0
+    if ma5 != ma5 or ma10 != ma10 or ma20 != ma20 or ma50 != ma50:
+        ma_score = 0.0
+        ma_code = -1
+    else:
+        if close > ma5:
+            alignment_count += 1
+        if ma5 > ma10:
+            alignment_count += 1
+        if ma10 > ma20:
+            alignment_count += 1
+        if ma20 > ma50:
+            alignment_count += 1
+        ma_score = 25.0 * alignment_count
+        ma_code = alignment_count
+
+    # 2. ADX强度
+    if adx != adx or plus_di != plus_di or minus_di != minus_di:
+        adx_score = 0.0
+        adx_code = -1
+    elif plus_di <= minus_di:
+        adx_score = 0.0
+        adx_code = 0
+    elif 25 <= adx <= 40:
+        adx_score = 100.0
+        adx_code = 1
+    elif 40 < adx <= 50:
+        adx_score = 70.0
+        adx_code = 2
+    elif adx > 50:
+        adx_score = 50.0
+        adx_code = 3
+    elif 20 <= adx < 25:
+        adx_score = 60.0
+        adx_code = 4
+    else:
+        adx_score = 30.0
+        adx_code = 5
+
+    # 3. 价格动量
+    if return_5d != return_5d:
+        momentum_score = 0.0
+        momentum_code = -1
+    elif return_5d >= 10:
+        momentum_score = 100.0
+        momentum_code = 0
+    elif return_5d >= 5:
+        momentum_score = 70.0
+        momentum_code = 1
+    elif return_5d >= 2:
+        momentum_score = 50.0
+        momentum_code = 2
+    elif return_5d >= 0:
+        momentum_score = 30.0
+        momentum_code = 3
+    else:
+        momentum_score = 0.0
+        momentum_code = 4
+
+    # 4. 价格位置（最高/最低价忽略NaN，与pandas的max/min一致）
+    high_20 = np.nan
+    low_20 = np.nan
+    position = 0.5
+    if high_tail.shape[0] < POSITION_LOOKBACK:
+        position_score = 50.0
+        position_code = 5
+    else:
+        for i in range(high_tail.shape[0]):
+            high = high_tail[i]
+            low = low_tail[i]
+            if high == high and (high_20 != high_20 or high > high_20):
+                high_20 = high
+            if low == low and (low_20 != low_20 or low < low_20):
+                low_20 = low
+        if high_20 == low_20:
+            position_score = 50.0
+            position_code = 6
+        else:
+            position = (close - low_20) / (high_20 - low_20)
+            if 0.5 <= position <= 0.75:
+                position_score = 100.0
+                position_code = 0
+            elif 0.75 < position <= 0.85:
+                position_score = 80.0
+                position_code = 1
+            elif 0.3 <= position < 0.5:
+                position_score = 60.0
+                position_code = 2
+            elif position > 0.85:
+                position_score = 30.0
+                position_code = 3
+            else:
+                position_score = 20.0
+                position_code = 4
+
+    total = (
+        ma_score * weights[0] +
+        adx_score * weights[1] +
+        momentum_score * weights[2] +
+        position_score * weights[3]
+    )
+
+    return (total, ma_score, adx_score, momentum_score, position_score,
+            ma_code, alignment_count, adx_code, momentum_code, position_code, position, high_20, low_20)
+
+
 class MAADXScorer(BaseTrendScorer):
     """均线排列+ADX强度评分器"""
     
@@ -15,6 +172,22 @@ class MAADXScorer(BaseTrendScorer):
     NAME = "ma_adx"
     DESCRIPTION = "基于均线排列和ADX强度的趋势评分器"
     
+    # 评分时需要读取最新值的列及缺失时的默认值，顺序与 _ma_adx_kernel 的输入一致
+    LATEST_COLUMNS = (
+        ('close', np.nan),
+        ('sma_5', 0.0), ('sma_10', 0.0), ('sma_20', 0.0), ('sma_50', 0.0),
+        ('adx', np.nan), ('plus_di', np.nan), ('minus_di', np.nan),
+        ('price_change_5d', 0.0)
+    )
+    
+    # 评分需要的全部指标列（get_required_indicators 直接返回，不再每次新建列表）
+    _REQ_COLUMNS = (
+        'close', 'high', 'low',
+        'sma_5', 'sma_10', 'sma_20', 'sma_50',
+        'adx', 'plus_di', 'minus_di',
+        'price_change_5d'
+    )
+    
     def __init__(self, config: dict):
         """
         初始化评分器
@@ -36,6 +209,23 @@ class MAADXScorer(BaseTrendScorer):
             'price_momentum': 0.15,
             'price_position': 0.10
         })
+        self._weights_arr = np.array([
+            self.weights['ma_alignment'],
+            self.weights['adx_strength'],
+            self.weights['price_momentum'],
+            self.weights['price_position']
+        ], dtype=np.float64)
+        
+        # 空数据的默认得分只构造一次（内层字典为各次结果共享，调用方不应修改）
+        self._empty_template = {
+            'total': 0,
+            'components': {
+                name: {'score': 0, 'weight': self.weights[name], 'weighted_score': 0, 'details': {}}
+                for name in ('ma_alignment', 'adx_strength', 'price_momentum', 'price_position')
+            },
+            'pass_threshold': False,
+            'details': {'scorer': self.NAME, 'version': self.VERSION, 'error': 'empty_data'}
+        }
     
     def score(self, df: pd.DataFrame) -> Dict:
         """
@@ -50,292 +240,262 @@ class MAADXScorer(BaseTrendScorer):
         if df is None or df.empty:
             return self._empty_score()
         
-        latest = df.iloc[-1]
-        
-        # 1. 均线排列得分 (0-100)
-        ma_score, ma_details = self._score_ma_alignment(latest)
-        
-        # 2. ADX强度得分 (0-100)
-        adx_score, adx_details = self._score_adx_strength(latest)
+        vec, high_tail, low_tail = self._latest_inputs(df)
+        return self._format_score(vec, *_ma_adx_kernel(vec, high_tail, low_tail, self._weights_arr))
+    
+    def score_batch(self, data: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+        """
+        批量计算所有股票的趋势得分，与逐只调用 score 结果一致
         
-        # 3. 价格动量得分 (0-100)
-        momentum_score, momentum_details = self._score_price_momentum(latest)
+        将所有股票的最新值堆叠为 (N, 9) 数组、最近20天的最高/最低价堆叠为 (M, 20) 数组，
+        四项得分均按列一次性计算。
         
-        # 4. 价格位置得分 (0-100)
-        position_score, position_details = self._score_price_position(df)
-        
-        # 加权总分
-        total = (
-            ma_score * self.weights['ma_alignment'] +
-            adx_score * self.weights['adx_strength'] +
-            momentum_score * self.weights['price_momentum'] +
-            position_score * self.weights['price_position']
-        )
+        Args:
+            data: 股票数据字典 {ticker: dataframe}
         
-        return {
-            'total': round(total, 2),
-            'components': {
-                'ma_alignment': {
-                    'score': round(ma_score, 2),
-                    'weight': self.weights['ma_alignment'],
-                    'weighted_score': round(ma_score * self.weights['ma_alignment'], 2),
-                    'details': ma_details
-                },
-                'adx_strength': {
-                    'score': round(adx_score, 2),
-                    'weight': self.weights['adx_strength'],
-                    'weighted_score': round(adx_score * self.weights['adx_strength'], 2),
-                    'details': adx_details
-                },
-                'price_momentum': {
-                    'score': round(momentum_score, 2),
-                    'weight': self.weights['price_momentum'],
-                    'weighted_score': round(momentum_score * self.weights['price_momentum'], 2),
-                    'details': momentum_details
-                },
-                'price_position': {
-                    'score': round(position_score, 2),
-                    'weight': self.weights['price_position'],
-                    'weighted_score': round(position_score * self.weights['price_position'], 2),
-                    'details': position_details
-                }
-            },
-            'pass_threshold': total >= 50.0,
-            'details': {
-                'scorer': self.NAME,
-                'version': self.VERSION
-            }
-        }
+        Returns:
+            Dict[str, Dict]: {ticker: 评分结果}
+        """
+        results = {}
+        tickers, vecs, high_tails, low_tails, has_window = [], [], [], [], []
+        for ticker, df in data.items():
+            if df is None or df.empty:
+                results[ticker] = self._empty_score()
+                continue
+            vec, high_tail, low_tail = self._latest_inputs(df)
+            tickers.append(ticker)
+            vecs.append(vec)
+            has_window.append(len(high_tail) == POSITION_LOOKBACK)
+            if has_window[-1]:
+                high_tails.append(high_tail)
+                low_tails.append(low_tail)
+        
+        if tickers:
+            rows = np.vstack(vecs)
+            has_window = np.array(has_window, dtype=bool)
+            outputs = self._score_arrays(rows, has_window, high_tails, low_tails)
+            for i, ticker in enumerate(tickers):
+                results[ticker] = self._format_score(rows[i], *(column[i] for column in outputs))
+        
+        return {ticker: results[ticker] for ticker in data}
     
-    def _score_ma_alignment(self, latest: pd.Series) -> tuple:
+    def _score_arrays(self, rows: np.ndarray, has_window: np.ndarray,
+                      high_tails: List[np.ndarray], low_tails: List[np.ndarray]) -> tuple:
         """
-        评估均线排列 (0-100分)
+        按列计算所有股票的四项得分，返回值与 _ma_adx_kernel 一一对应（每项为长度N的列表）
         
         Args:
-            latest: 最新一行数据
+            rows: (N, 9) 最新值数组，列顺序同 LATEST_COLUMNS
+            has_window: (N,) 是否有足够的数据计算价格位置
+            high_tails: 有足够数据的股票最近20天的最高价
+            low_tails: 有足够数据的股票最近20天的最低价
         
         Returns:
-            tuple: (score, details)
+            tuple: 同 _ma_adx_kernel
         """
-        ma5 = latest.get('sma_5', 0)
-        ma10 = latest.get('sma_10', 0)
-        ma20 = latest.get('sma_20', 0)
-        ma50 = latest.get('sma_50', 0)
-        price = latest['close']
-        
-        # 检查数据有效性
-        if pd.isna(ma5) or pd.isna(ma10) or pd.isna(ma20) or pd.isna(ma50):
-            return 0, {'status': 'no_data', 'error': 'Missing MA data'}
-        
-        # 检查多头排列
-        alignment_count = 0
-        if price > ma5: alignment_count += 1
-        if ma5 > ma10: alignment_count += 1
-        if ma10 > ma20: alignment_count += 1
-        if ma20 > ma50: alignment_count += 1
-        
-        # 计算得分
-        if alignment_count == 4:
-            score = 100  # 完美多头排列
-            status = "perfect_bullish"
-        elif alignment_count == 3:
-            score = 75   # 三线多头
-            status = "strong_bullish"
-        elif alignment_count == 2:
-            score = 50   # 两线多头
-            status = "moderate_bullish"
-        elif alignment_count == 1:
-            score = 25
-            status = "weak_bullish"
-        else:
-            score = 0
-            status = "no_alignment"
-        
-        details = {
-            'status': status,
-            'alignment_count': alignment_count,
-            'price': round(float(price), 2),
-            'ma5': round(float(ma5), 2),
-            'ma10': round(float(ma10), 2),
-            'ma20': round(float(ma20), 2),
-            'ma50': round(float(ma50), 2)
-        }
-        
-        return score, details
+        n = rows.shape[0]
+        close, ma5, ma10, ma20, ma50, adx, plus_di, minus_di, return_5d = rows.T
+        
+        # 1. 均线排列
+        ma_missing = np.isnan(rows[:, 1:5]).any(axis=1)
+        alignment_count = np.where(
+            ma_missing, 0,
+            (close > ma5).astype(np.int64) + (ma5 > ma10) + (ma10 > ma20) + (ma20 > ma50)
+        )
+        ma_score = np.select(
+            [ma_missing, alignment_count == 4, alignment_count == 3, alignment_count == 2, alignment_count == 1],
+            [0.0, 100.0, 75.0, 50.0, 25.0], 0.0
+        )
+        ma_code = np.where(ma_missing, -1, alignment_count)
+        
+        # 2. ADX强度（先按分档查表，再处理数据缺失和下跌趋势）
+        adx_bin = (np.searchsorted(ADX_LEFT_BINS, adx, side='right') +
+                   np.searchsorted(ADX_RIGHT_BINS, adx, side='left'))
+        adx_missing = np.isnan(adx) | np.isnan(plus_di) | np.isnan(minus_di)
+        adx_down = ~adx_missing & (plus_di <= minus_di)
+        adx_score = ADX_SCORES[adx_bin]
+        adx_score[adx_missing | adx_down] = 0.0
+        adx_code = ADX_CODES[adx_bin]
+        adx_code[adx_down] = 0
+        adx_code[adx_missing] = -1
+        
+        # 3. 价格动量
+        momentum_bin = np.searchsorted(MOMENTUM_BINS, return_5d, side='right')
+        momentum_missing = np.isnan(return_5d)
+        momentum_score = MOMENTUM_SCORES[momentum_bin]
+        momentum_score[momentum_missing] = 0.0
+        momentum_code = MOMENTUM_CODES[momentum_bin]
+        momentum_code[momentum_missing] = -1
+        
+        # 4. 价格位置
+        high_20 = np.full(n, np.nan)
+        low_20 = np.full(n, np.nan)
+        if high_tails:
+            with warnings.catch_warnings():
+                # 整个窗口都是NaN时结果为NaN，与pandas的max/min一致
+                warnings.simplefilter('ignore', RuntimeWarning)
+                high_20[has_window] = np.nanmax(np.vstack(high_tails), axis=1)
+                low_20[has_window] = np.nanmin(np.vstack(low_tails), axis=1)
+        flat = has_window & (high_20 == low_20)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            position = np.where(has_window & ~flat, (close - low_20) / (high_20 - low_20), 0.5)
+        # NaN不满足任何区间条件，归入最低一档
+        position_bin = np.where(
+            np.isnan(position), 0,
+            np.searchsorted(POSITION_LEFT_BINS, position, side='right') +
+            np.searchsorted(POSITION_RIGHT_BINS, position, side='left')
+        )
+        position_score = POSITION_SCORES[position_bin]
+        position_code = POSITION_CODES[position_bin]
+        position_score[~has_window | flat] = 50.0
+        position_code[flat] = 6
+        position_code[~has_window] = 5
+        
+        # 加权总分（与逐只评分的求和顺序一致）
+        w = self._weights_arr
+        total = ma_score * w[0] + adx_score * w[1] + momentum_score * w[2] + position_score * w[3]
+        
+        return tuple(column.tolist() for column in (
+            total, ma_score, adx_score, momentum_score, position_score,
+            ma_code, alignment_count, adx_code, momentum_code, position_code,
+            position, high_20, low_20
+        ))
     
-    def _score_adx_strength(self, latest: pd.Series) -> tuple:
+    def _latest_inputs(self, df: pd.DataFrame) -> tuple:
         """
-        评估ADX强度 (0-100分)
+        读取评分所需的最新值和最近20天的最高/最低价
         
         Args:
-            latest: 最新一行数据
+            df: 包含技术指标的非空DataFrame
         
         Returns:
-            tuple: (score, details)
+            tuple: (最新值数组, 最高价数组, 最低价数组)，数据不足20天时后两者为空数组
         """
-        adx = latest.get('adx', np.nan)
-        plus_di = latest.get('plus_di', np.nan)
-        minus_di = latest.get('minus_di', np.nan)
-        
-        # ADX评分规则
-        if pd.isna(adx) or pd.isna(plus_di) or pd.isna(minus_di):
-            return 0, {'status': 'no_data', 'adx': None}
-        
-        # 必须是上涨趋势
-        if plus_di <= minus_di:
-            score = 0
-            status = "downtrend"
-        # ADX理想区间 25-40
-        elif 25 <= adx <= 40:
-            score = 100
-            status = "strong_uptrend"
-        # ADX过高可能过热
-        elif 40 < adx <= 50:
-            score = 70
-            status = "very_strong_uptrend"
-        elif adx > 50:
-            score = 50
-            status = "overheated"
-        # ADX 20-25 趋势形成中
-        elif 20 <= adx < 25:
-            score = 60
-            status = "forming_uptrend"
-        # ADX太低，无明确趋势
+        # 最新一行只取评分用到的列，直接读取各列底层数组的末尾，不构造行Series
+        columns = df.columns
+        if 'close' not in columns:
+            raise KeyError('close')
+        vec = np.array([
+            df[col].to_numpy()[-1] if col in columns else default
+            for col, default in self.LATEST_COLUMNS
+        ], dtype=np.float64)
+        
+        # 价格位置需要最近20天的最高/最低价，数据不足时无需读取
+        if len(df) >= POSITION_LOOKBACK:
+            high_tail = np.asarray(df['high'].to_numpy()[-POSITION_LOOKBACK:], dtype=np.float64)
+            low_tail = np.asarray(df['low'].to_numpy()[-POSITION_LOOKBACK:], dtype=np.float64)
         else:
-            score = 30
-            status = "weak_trend"
-        
-        details = {
-            'status': status,
-            'adx': round(float(adx), 2),
-            'plus_di': round(float(plus_di), 2),
-            'minus_di': round(float(minus_di), 2),
-            'di_diff': round(float(plus_di - minus_di), 2)
-        }
+            high_tail = low_tail = np.empty(0)
         
-        return score, details
+        return vec, high_tail, low_tail
     
-    def _score_price_momentum(self, latest: pd.Series) -> tuple:
+    def _format_score(self, vec: np.ndarray, total: float,
+                      ma_score: float, adx_score: float, momentum_score: float, position_score: float,
+                      ma_code: int, alignment_count: int, adx_code: int, momentum_code: int, position_code: int,
+                      position: float, high_20: float, low_20: float) -> Dict:
         """
-        评估价格动量 (0-100分)
+        根据各项得分和状态码组装评分结果及详细信息
         
         Args:
-            latest: 最新一行数据
+            vec: 最新值数组
+            其余参数: _ma_adx_kernel 的返回值
         
         Returns:
-            tuple: (score, details)
+            Dict: 评分结果
         """
-        # 使用5日涨跌幅作为动量指标
-        return_5d = latest.get('price_change_5d', 0)
-        
-        if pd.isna(return_5d):
-            return 0, {'status': 'no_data', 'return_pct': None}
-        
-        # 评分规则
-        if return_5d >= 10:
-            score = 100
-            status = "strong_momentum"
-        elif return_5d >= 5:
-            score = 70
-            status = "good_momentum"
-        elif return_5d >= 2:
-            score = 50
-            status = "moderate_momentum"
-        elif return_5d >= 0:
-            score = 30
-            status = "weak_momentum"
+        close, ma5, ma10, ma20, ma50, adx, plus_di, minus_di, return_5d = vec.tolist()
+        
+        # 1. 均线排列得分 (0-100)
+        if ma_code < 0:
+            ma_details = {'status': 'no_data', 'error': 'Missing MA data'}
         else:
-            score = 0
-            status = "negative_momentum"
+            ma_details = {
+                'status': MA_STATUS[ma_code],
+                'alignment_count': alignment_count,
+                'price': round(close, 2),
+                'ma5': round(ma5, 2),
+                'ma10': round(ma10, 2),
+                'ma20': round(ma20, 2),
+                'ma50': round(ma50, 2)
+            }
         
-        details = {
-            'status': status,
-            'return_pct': round(float(return_5d), 2)
-        }
+        # 2. ADX强度得分 (0-100)
+        if adx_code < 0:
+            adx_details = {'status': 'no_data', 'adx': None}
+        else:
+            adx_details = {
+                'status': ADX_STATUS[adx_code],
+                'adx': round(adx, 2),
+                'plus_di': round(plus_di, 2),
+                'minus_di': round(minus_di, 2),
+                'di_diff': round(plus_di - minus_di, 2)
+            }
         
-        return score, details
+        # 3. 价格动量得分 (0-100)
+        if momentum_code < 0:
+            momentum_details = {'status': 'no_data', 'return_pct': None}
+        else:
+            momentum_details = {
+                'status': MOMENTUM_STATUS[momentum_code],
+                'return_pct': round(return_5d, 2)
+            }
+        
+        # 4. 价格位置得分 (0-100)
+        position_status = POSITION_STATUS[position_code]
+        if position_status in ('insufficient_data', 'flat'):
+            position_details = {'position': 0.5, 'status': position_status}
+        else:
+            position_details = {
+                'status': position_status,
+                'position': round(float(position), 3),
+                'high_20d': round(float(high_20), 2),
+                'low_20d': round(float(low_20), 2),
+                'current': round(close, 2)
+            }
+        
+        return self._build_result(
+            float(total),
+            (int(ma_score), int(adx_score), int(momentum_score), int(position_score)),
+            (ma_details, adx_details, momentum_details, position_details)
+        )
     
-    def _score_price_position(self, df: pd.DataFrame) -> tuple:
+    def _build_result(self, total: float, scores: tuple, details: tuple) -> Dict:
         """
-        评估价格相对位置 (0-100分)
+        组装评分结果
         
         Args:
-            df: 完整的DataFrame
+            total: 加权总分
+            scores: 四项得分 (均线排列, ADX强度, 价格动量, 价格位置)
+            details: 四项得分的详细信息
         
         Returns:
-            tuple: (score, details)
+            Dict: 评分结果
         """
-        # 计算过去20天的高低点
-        recent_20 = df.tail(20)
-        
-        if len(recent_20) < 20:
-            return 50, {'position': 0.5, 'status': 'insufficient_data'}
-        
-        high_20 = recent_20['high'].max()
-        low_20 = recent_20['low'].min()
-        current_price = df.iloc[-1]['close']
+        components = {}
+        for name, score, detail in zip(
+            ('ma_alignment', 'adx_strength', 'price_momentum', 'price_position'), scores, details
+        ):
+            components[name] = {
+                'score': round(score, 2),
+                'weight': self.weights[name],
+                'weighted_score': round(score * self.weights[name], 2),
+                'details': detail
+            }
         
-        # 避免除零
-        if high_20 == low_20:
-            return 50, {'position': 0.5, 'status': 'flat'}
-        
-        # 相对位置 0-1
-        position = (current_price - low_20) / (high_20 - low_20)
-        
-        # 评分规则：0.5-0.75是理想区间
-        if 0.5 <= position <= 0.75:
-            score = 100
-            status = "ideal_position"
-        elif 0.75 < position <= 0.85:
-            score = 80
-            status = "high_position"
-        elif 0.3 <= position < 0.5:
-            score = 60
-            status = "mid_position"
-        elif position > 0.85:
-            score = 30
-            status = "too_high"
-        else:
-            score = 20
-            status = "low_position"
-        
-        details = {
-            'status': status,
-            'position': round(float(position), 3),
-            'high_20d': round(float(high_20), 2),
-            'low_20d': round(float(low_20), 2),
-            'current': round(float(current_price), 2)
+        return {
+            'total': round(total, 2),
+            'components': components,
+            'pass_threshold': total >= 50.0,
+            'details': {
+                'scorer': self.NAME,
+                'version': self.VERSION
+            }
         }
-        
-        return score, details
     
-    def get_required_indicators(self) -> List[str]:
+    def get_required_indicators(self) -> Tuple[str, ...]:
         """返回需要的指标"""
-        return [
-            'close', 'high', 'low',
-            'sma_5', 'sma_10', 'sma_20', 'sma_50',
-            'adx', 'plus_di', 'minus_di',
-            'price_change_5d'
-        ]
+        return self._REQ_COLUMNS
     
     def _empty_score(self) -> Dict:
-        """返回空数据的默认得分"""
-        return {
-            'total': 0,
-            'components': {
-                'ma_alignment': {'score': 0, 'weight': self.weights['ma_alignment'], 'weighted_score': 0, 'details': {}},
-                'adx_strength': {'score': 0, 'weight': self.weights['adx_strength'], 'weighted_score': 0, 'details': {}},
-                'price_momentum': {'score': 0, 'weight': self.weights['price_momentum'], 'weighted_score': 0, 'details': {}},
-                'price_position': {'score': 0, 'weight': self.weights['price_position'], 'weighted_score': 0, 'details': {}}
-            },
-            'pass_threshold': False,
-            'details': {'scorer': self.NAME, 'version': self.VERSION, 'error': 'empty_data'}
-        }
-
-
-
-
-
-
-
-
+        """返回空数据的默认得分（预构造模板的浅拷贝）"""
+        return dict(self._empty_template)
@@ -2,11 +2,41 @@
 Utility functions - 工具函数模块
 """
 
+import json
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import List
+from pathlib import Path
+from typing import Dict, List, Optional
 import pandas as pd
 
+# lxml 可选：可用时用XPath直接读取股票代码列，否则回退到 pd.read_html
+try:
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+
+# 股票代码列可能使用的表头
+TICKER_HEADERS = ('Symbol', 'Ticker')
+
+# 指数成分股列表的本地缓存（成分股一年只变动几次，避免每次都请求并解析Wikipedia页面）
+TICKER_CACHE_DIR = Path.home() / '.cache' / 'stock_screener'
+TICKER_CACHE_TTL = 7 * 24 * 3600  # 7天
+
+# 进程内缓存 {缓存名: 股票列表}
+_ticker_memo: Dict[str, List[str]] = {}
+
+# 获取成分股页面用的HTTP会话（首次使用时创建，复用连接）
+_http_session = None
+
+# 请求Wikipedia时的headers（User-Agent避免403）
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
 
 def setup_logger(name: str, log_file: str, level=logging.INFO) -> logging.Logger:
     """
@@ -48,20 +78,15 @@ def get_custom_tickers(file_path: str = 'config/custom_tickers.txt') -> List[str
     Returns:
         List[str]: 股票代码列表
     """
-    import os
-    
-    if not os.path.exists(file_path):
+    path = Path(file_path)
+    if not path.exists():
         logging.warning(f"自定义股票列表文件不存在: {file_path}")
         return []
     
-    tickers = []
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                # 跳过空行和注释
-                if line and not line.startswith('#'):
-                    tickers.append(line.upper())
+        # 一次读取整个文件再按行拆分，跳过空行和注释
+        lines = (line.strip() for line in path.read_text().splitlines())
+        tickers = [line.upper() for line in lines if line and not line.startswith('#')]
         
         logging.info(f"从 {file_path} 加载了 {len(tickers)} 只股票")
         return tickers
@@ -70,6 +95,118 @@ def get_custom_tickers(file_path: str = 'config/custom_tickers.txt') -> List[str
         return []
 
 
+def _load_cached_tickers(name: str) -> Optional[List[str]]:
+    """
+    读取缓存的股票列表（先查进程内缓存，再查未过期的磁盘缓存）
+    
+    Args:
+        name: 缓存名（如 sp500）
+    
+    Returns:
+        List[str]: 股票代码列表，未命中时返回None
+    """
+    if name in _ticker_memo:
+        return list(_ticker_memo[name])
+    
+    cache_path = TICKER_CACHE_DIR / f'{name}.json'
+    try:
+        if time.time() - cache_path.stat().st_mtime >= TICKER_CACHE_TTL:
+            return None
+        tickers = json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    
+    if not isinstance(tickers, list) or not tickers:
+        return None
+    
+    _ticker_memo[name] = tickers
+    logging.info(f"从缓存加载了 {len(tickers)} 只股票: {cache_path}")
+    return list(tickers)
+
+
+def _save_cached_tickers(name: str, tickers: List[str]):
+    """
+    缓存股票列表到进程内和磁盘（写入失败只记录日志）
+    
+    Args:
+        name: 缓存名
+        tickers: 股票代码列表
+    """
+    _ticker_memo[name] = list(tickers)
+    
+    cache_path = TICKER_CACHE_DIR / f'{name}.json'
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(tickers), encoding='utf-8')
+    except OSError as e:
+        logging.debug(f"写入股票列表缓存失败: {e}")
+
+
+def _get_http_session():
+    """
+    获取共享的requests会话
+    
+    多次请求复用同一个keep-alive连接，省去重复的TCP/TLS握手。
+    
+    Returns:
+        requests.Session: HTTP会话
+    """
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        session.headers.update(HTTP_HEADERS)
+        session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+        _http_session = session
+    return _http_session
+
+
+def _parse_ticker_table(html_text: str, table_id: Optional[str] = None,
+                        min_count: int = 1) -> Optional[List[str]]:
+    """
+    从HTML页面的表格中提取股票代码列
+    
+    lxml可用时只用XPath读取表头和目标列，不解析整页表格为DataFrame；
+    依次检查表格，返回第一个包含 Symbol/Ticker 列且代码数量足够的结果。
+    
+    Args:
+        html_text: 页面HTML
+        table_id: 只检查指定id的表格（None表示检查所有表格）
+        min_count: 至少需要的股票数量
+    
+    Returns:
+        List[str]: 股票代码列表（'.' 已替换为 '-'），未找到时返回None
+    """
+    if LXML_AVAILABLE:
+        tree = lxml_html.fromstring(html_text)
+        table_xpath = f'//table[@id="{table_id}"]' if table_id else '//table'
+        for table in tree.xpath(table_xpath):
+            header = [th.text_content().strip() for th in table.xpath('(.//tr[th])[1]/th')]
+            name = next((h for h in TICKER_HEADERS if h in header), None)
+            if name is None:
+                continue
+            cells = table.xpath(f'.//tr[td]/td[{header.index(name) + 1}]')
+            tickers = [cell.text_content().strip() for cell in cells]
+            tickers = [ticker.replace('.', '-') for ticker in tickers if ticker]
+            if len(tickers) >= min_count:
+                return tickers
+        return None
+    
+    from io import StringIO
+    tables = pd.read_html(StringIO(html_text), attrs={'id': table_id} if table_id else None)
+    for table in tables:
+        name = next((h for h in TICKER_HEADERS if h in table.columns), None)
+        if name is None:
+            continue
+        tickers = [str(ticker).replace('.', '-') for ticker in table[name].tolist()
+                   if str(ticker) not in ['nan', 'None']]
+        if len(tickers) >= min_count:
+            return tickers
+    return None
+
+
 def get_sp500_tickers() -> List[str]:
     """
     获取S&P 500成分股列表
@@ -77,22 +214,20 @@ def get_sp500_tickers() -> List[str]:
     Returns:
         List[str]: 股票代码列表
     """
+    cached = _load_cached_tickers('sp500')
+    if cached is not None:
+        return cached
+    
     try:
-        # 从Wikipedia获取S&P 500列表，添加headers避免403
-        import requests
-        from io import StringIO
-        
+        # 从Wikipedia获取S&P 500列表
         url = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        tables = pd.read_html(StringIO(response.text))
-        df = tables[0]
-        tickers = df['Symbol'].tolist()
-        # 清理股票代码（处理特殊字符）
-        tickers = [ticker.replace('.', '-') for ticker in tickers]
+        response = _get_http_session().get(url, timeout=10)
+        # 只解析成分股表格
+        tickers = _parse_ticker_table(response.text, table_id='constituents')
+        if not tickers:
+            raise Exception("未找到成分股表格")
         logging.info(f"成功获取 {len(tickers)} 只S&P 500股票")
+        _save_cached_tickers('sp500', tickers)
         return tickers
     except Exception as e:
         logging.error(f"获取S&P 500列表失败: {e}")
@@ -108,28 +243,21 @@ def get_nasdaq100_tickers() -> List[str]:
     Returns:
         List[str]: 股票代码列表
     """
+    cached = _load_cached_tickers('nasdaq100')
+    if cached is not None:
+        return cached
+    
     try:
         # 尝试从Wikipedia获取
         url = 'https://en.wikipedia.org/wiki/Nasdaq-100'
-        # 添加headers避免403错误
-        import requests
-        from io import StringIO
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        tables = pd.read_html(StringIO(response.text))
+        response = _get_http_session().get(url, timeout=10)
         
-        # 尝试不同的表格索引
-        for table in tables:
-            if 'Ticker' in table.columns or 'Symbol' in table.columns:
-                ticker_col = 'Ticker' if 'Ticker' in table.columns else 'Symbol'
-                tickers = table[ticker_col].tolist()
-                tickers = [str(ticker).replace('.', '-') for ticker in tickers if str(ticker) not in ['nan', 'None']]
-                if len(tickers) > 50:  # 确保获取到足够多的股票
-                    logging.info(f"成功获取 {len(tickers)} 只NASDAQ 100股票")
-                    return tickers
+        # 依次尝试各个表格，确保获取到足够多的股票
+        tickers = _parse_ticker_table(response.text, min_count=51)
+        if tickers:
+            logging.info(f"成功获取 {len(tickers)} 只NASDAQ 100股票")
+            _save_cached_tickers('nasdaq100', tickers)
+            return tickers
         
         raise Exception("未找到有效的股票列表")
         
@@ -175,8 +303,10 @@ def validate_dataframe(df: pd.DataFrame, required_columns: List[str]) -> bool:
     if df is None or df.empty:
         return False
     
-    missing_columns = set(required_columns) - set(df.columns)
-    if missing_columns:
+    # 列名Index本身支持哈希查找，逐列判断即可，无需每次把df.columns转成集合
+    columns = df.columns
+    if not all(col in columns for col in required_columns):
+        missing_columns = {col for col in required_columns if col not in columns}
         logging.warning(f"缺少必需的列: {missing_columns}")
         return False
     
@@ -2,150 +2,265 @@
 """
 Alpha Vantage 调试脚本
 用于诊断API连接和响应问题
+
+用法:
+    python3 tests/debug_alphavantage.py            # 诊断默认股票
+    python3 tests/debug_alphavantage.py AAPL MSFT  # 同时诊断多只股票（请求并发发送）
+    python3 tests/debug_alphavantage.py --no-cache # 跳过一小时内的响应缓存，直接请求API
 """
 
-import requests
+import sys
 import json
+import asyncio
 from datetime import datetime, timedelta
 
+import numpy as np
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from http_cache import cache_enabled, load_json, save_json
+
 # 使用你的API key
 API_KEY = "JCYHE2IJVOIWUA52"
-TICKER = "AAPL"
-
-print("="*60)
-print("Alpha Vantage API 调试")
-print("="*60)
-
-# 测试1: 检查API key是否有效
-print("\n[测试1] 检查API连接和key有效性")
-print(f"API Key: {API_KEY}")
-print(f"测试股票: {TICKER}")
-
-url = 'https://www.alphavantage.co/query'
-params = {
-    'function': 'TIME_SERIES_DAILY',
-    'symbol': TICKER,
-    'outputsize': 'compact',  # 先用compact测试
-    'apikey': API_KEY,
-    'datatype': 'json'
+TICKERS = [arg for arg in sys.argv[1:] if not arg.startswith('--')] or ["AAPL"]
+USE_CACHE = cache_enabled()
+
+URL = 'https://www.alphavantage.co/query'
+
+# 响应字段 -> DataFrame列名
+FIELD_MAP = {
+    '1. open': 'open',
+    '2. high': 'high',
+    '3. low': 'low',
+    '4. close': 'close',
+    '5. volume': 'volume'
 }
 
-print(f"\n请求URL: {url}")
-print(f"请求参数: {params}")
 
-try:
+def build_params(ticker):
+    """构造单只股票的请求参数"""
+    return {
+        'function': 'TIME_SERIES_DAILY',
+        'symbol': ticker,
+        'outputsize': 'compact',  # 先用compact测试
+        'apikey': API_KEY,
+        'datatype': 'json'
+    }
+
+
+async def probe(session, ticker):
+    """
+    请求单只股票的数据
+
+    Returns:
+        tuple: (股票代码, 状态码, 解析后的JSON或响应文本, 异常)
+    """
+    cache_key = f"debug_{ticker}"
+    if USE_CACHE:
+        data = load_json(cache_key)
+        if data is not None:
+            print(f"{ticker}: 使用缓存的响应（--no-cache 跳过缓存）")
+            return ticker, 200, data, None
+
+    try:
+        async with session.get(URL, params=build_params(ticker),
+                               timeout=aiohttp.ClientTimeout(total=30)) as resp:
+            if resp.status != 200:
+                return ticker, resp.status, await resp.text(), None
+            # 优先用orjson直接解析响应字节
+            data = orjson.loads(await resp.read()) if orjson is not None else await resp.json(content_type=None)
+    except Exception as e:
+        return ticker, None, None, e
+
+    if USE_CACHE:
+        save_json(cache_key, data)
+    return ticker, 200, data, None
+
+
+async def probe_all(tickers):
+    """复用同一个会话并发请求所有股票，连接数限制为4"""
+    connector = aiohttp.TCPConnector(limit=4)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(*[probe(session, t) for t in tickers])
+
+
+def preview(data, max_items=3):
+    """只保留每个嵌套字典的前几项，用于打印响应结构而不格式化整个响应"""
+    return {
+        key: {k: value[k] for k in list(value)[:max_items]} if isinstance(value, dict) else value
+        for key, value in data.items()
+    }
+
+
+def diagnose(ticker, status, data, error):
+    """
+    检查单只股票的响应并模拟解析过程
+
+    Returns:
+        bool: 是否诊断通过
+    """
+    print("\n" + "="*60)
+    print(f"测试股票: {ticker}")
+    print("="*60)
+
+    if error is not None:
+        if isinstance(error, asyncio.TimeoutError):
+            print("\n❌ 请求超时")
+            print("建议: 检查网络连接")
+        elif isinstance(error, aiohttp.ClientConnectionError):
+            print("\n❌ 连接错误")
+            print("建议: 检查网络连接和防火墙设置")
+        else:
+            print(f"\n❌ 发生错误: {error}")
+        return False
+
+    print(f"响应状态码: {status}")
+
+    if status != 200:
+        print(f"❌ HTTP错误: {status}")
+        print(f"响应内容: {data[:500]}")
+        return False
+
+    try:
+        # 打印原始响应结构（嵌套数据只显示前3项）
+        print("\n原始响应结构:")
+        print(json.dumps(preview(data), indent=2)[:1000] + "...")
+
+        # 检查错误信息
+        if 'Error Message' in data:
+            print(f"\n❌ API错误: {data['Error Message']}")
+            return False
+
+        if 'Note' in data:
+            print(f"\n⚠️  API限流: {data['Note']}")
+            print("建议: 稍后再试或增加请求延迟")
+            return False
+
+        if 'Information' in data:
+            print(f"\n⚠️  API信息: {data['Information']}")
+            return False
+
+        # 查找时间序列数据
+        print("\n[测试2] 检查响应数据结构")
+        print(f"响应keys: {list(data.keys())}")
+
+        time_series_key = None
+        for key in data.keys():
+            if 'Time Series' in key:
+                time_series_key = key
+                print(f"✅ 找到时间序列key: {time_series_key}")
+                break
+
+        if not time_series_key:
+            print("❌ 未找到时间序列数据")
+            print("可用的keys:", list(data.keys()))
+            return False
+
+        # 检查数据内容
+        time_series = data[time_series_key]
+        dates = list(time_series.keys())
+
+        print(f"\n✅ 数据获取成功!")
+        print(f"数据点数量: {len(dates)}")
+        print(f"日期范围: {dates[-1]} 到 {dates[0]}")
+
+        # 显示最新几条数据
+        print("\n最新3条数据:")
+        for i, date in enumerate(dates[:3]):
+            print(f"  {date}: {time_series[date]}")
+
+        # 测试3: 检查数据格式
+        print("\n[测试3] 检查数据格式")
+        latest_date = dates[0]
+        latest_data = time_series[latest_date]
+        print(f"数据字段: {list(latest_data.keys())}")
+
+        # 检查是否有必需字段
+        expected_fields = list(FIELD_MAP)
+        missing_fields = [f for f in expected_fields if f not in latest_data]
+
+        if missing_fields:
+            print(f"⚠️  缺少字段: {missing_fields}")
+        else:
+            print("✅ 所有必需字段都存在")
+
+        # 测试4: 模拟解析过程
+        print("\n[测试4] 模拟数据解析")
+        import pandas as pd
+
+        # 按记录数预分配各列数组，一次遍历填充，不经过 from_dict 的中间结构和类型推断
+        n = len(time_series)
+        dates = np.empty(n, dtype='datetime64[D]')
+        columns = {name: np.empty(n, dtype=np.float64) for name in FIELD_MAP.values()}
+        for i, (date, values) in enumerate(time_series.items()):
+            dates[i] = date
+            for field, name in FIELD_MAP.items():
+                columns[name][i] = float(values.get(field, 'nan'))
+        df = pd.DataFrame(columns, index=pd.DatetimeIndex(dates), copy=False)
+        print(f"DataFrame形状: {df.shape}")
+        print(f"列名: {list(df.columns)}")
+        print(f"\n前3行:")
+        print(df.head(3))
+
+        # 测试日期过滤
+        start_date = datetime.now() - timedelta(days=30)
+        end_date = datetime.now()
+
+        # 排序后的DatetimeIndex按标签切片（二分查找），不构造布尔掩码
+        df = df.sort_index()
+        df_filtered = df.loc[start_date:end_date]
+
+        print(f"\n日期过滤后 ({start_date.date()} 到 {end_date.date()}):")
+        print(f"剩余数据点: {len(df_filtered)}")
+
+        if len(df_filtered) == 0:
+            print("⚠️  日期过滤后没有数据 - 这可能是问题所在!")
+            print(f"数据日期范围: {df.index.min()} 到 {df.index.max()}")
+            print(f"请求日期范围: {start_date.date()} 到 {end_date.date()}")
+        else:
+            print("✅ 日期过滤正常")
+
+        return True
+
+    except Exception as e:
+        print(f"\n❌ 发生错误: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    print("="*60)
+    print("Alpha Vantage API 调试")
+    print("="*60)
+
+    if aiohttp is None:
+        print("\n❌ 未安装 aiohttp，无法发送请求 (pip install aiohttp)")
+        sys.exit(1)
+
+    # 测试1: 检查API key是否有效
+    print("\n[测试1] 检查API连接和key有效性")
+    print(f"API Key: {API_KEY}")
+    print(f"测试股票: {', '.join(TICKERS)}")
+    print(f"\n请求URL: {URL}")
+    print(f"请求参数: {build_params(TICKERS[0])}")
+
     print("\n发送请求...")
-    response = requests.get(url, params=params, timeout=30)
-    print(f"响应状态码: {response.status_code}")
-    
-    if response.status_code != 200:
-        print(f"❌ HTTP错误: {response.status_code}")
-        print(f"响应内容: {response.text[:500]}")
-        exit(1)
-    
-    data = response.json()
-    
-    # 打印原始响应（前面部分）
-    print("\n原始响应结构:")
-    print(json.dumps(data, indent=2)[:1000] + "...")
-    
-    # 检查错误信息
-    if 'Error Message' in data:
-        print(f"\n❌ API错误: {data['Error Message']}")
-        exit(1)
-    
-    if 'Note' in data:
-        print(f"\n⚠️  API限流: {data['Note']}")
-        print("建议: 稍后再试或增加请求延迟")
-        exit(1)
-    
-    if 'Information' in data:
-        print(f"\n⚠️  API信息: {data['Information']}")
-        exit(1)
-    
-    # 查找时间序列数据
-    print("\n[测试2] 检查响应数据结构")
-    print(f"响应keys: {list(data.keys())}")
-    
-    time_series_key = None
-    for key in data.keys():
-        if 'Time Series' in key:
-            time_series_key = key
-            print(f"✅ 找到时间序列key: {time_series_key}")
-            break
-    
-    if not time_series_key:
-        print("❌ 未找到时间序列数据")
-        print("可用的keys:", list(data.keys()))
-        exit(1)
-    
-    # 检查数据内容
-    time_series = data[time_series_key]
-    dates = list(time_series.keys())
-    
-    print(f"\n✅ 数据获取成功!")
-    print(f"数据点数量: {len(dates)}")
-    print(f"日期范围: {dates[-1]} 到 {dates[0]}")
-    
-    # 显示最新几条数据
-    print("\n最新3条数据:")
-    for i, date in enumerate(dates[:3]):
-        print(f"  {date}: {time_series[date]}")
-    
-    # 测试3: 检查数据格式
-    print("\n[测试3] 检查数据格式")
-    latest_date = dates[0]
-    latest_data = time_series[latest_date]
-    print(f"数据字段: {list(latest_data.keys())}")
-    
-    # 检查是否有必需字段
-    expected_fields = ['1. open', '2. high', '3. low', '4. close', '5. volume']
-    missing_fields = [f for f in expected_fields if f not in latest_data]
-    
-    if missing_fields:
-        print(f"⚠️  缺少字段: {missing_fields}")
-    else:
-        print("✅ 所有必需字段都存在")
-    
-    # 测试4: 模拟解析过程
-    print("\n[测试4] 模拟数据解析")
-    import pandas as pd
-    
-    df = pd.DataFrame.from_dict(time_series, orient='index')
-    print(f"DataFrame形状: {df.shape}")
-    print(f"列名: {list(df.columns)}")
-    print(f"\n前3行:")
-    print(df.head(3))
-    
-    # 测试日期过滤
-    start_date = datetime.now() - timedelta(days=30)
-    end_date = datetime.now()
-    
-    df.index = pd.to_datetime(df.index)
-    df = df.sort_index()
-    df_filtered = df[(df.index >= start_date) & (df.index <= end_date)]
-    
-    print(f"\n日期过滤后 ({start_date.date()} 到 {end_date.date()}):")
-    print(f"剩余数据点: {len(df_filtered)}")
-    
-    if len(df_filtered) == 0:
-        print("⚠️  日期过滤后没有数据 - 这可能是问题所在!")
-        print(f"数据日期范围: {df.index.min()} 到 {df.index.max()}")
-        print(f"请求日期范围: {start_date.date()} 到 {end_date.date()}")
-    else:
-        print("✅ 日期过滤正常")
-    
+    results = asyncio.run(probe_all(TICKERS))
+
+    passed = sum(diagnose(*result) for result in results)
+
     print("\n" + "="*60)
-    print("诊断完成!")
+    print(f"诊断完成! 通过 {passed}/{len(TICKERS)}")
     print("="*60)
 
-except requests.exceptions.Timeout:
-    print("\n❌ 请求超时")
-    print("建议: 检查网络连接")
-except requests.exceptions.ConnectionError:
-    print("\n❌ 连接错误")
-    print("建议: 检查网络连接和防火墙设置")
-except Exception as e:
-    print(f"\n❌ 发生错误: {e}")
-    import traceback
-    traceback.print_exc()
+    if passed < len(TICKERS):
+        sys.exit(1)
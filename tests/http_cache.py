@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+测试脚本的HTTP响应缓存
+重复运行测试/诊断脚本时直接从本地读取一小时内的响应，不再消耗API限流额度
+
+传入 --no-cache 参数可跳过缓存，直接请求API
+"""
+
+import os
+import sys
+import json
+import time
+
+# 缓存目录（tests/.http_cache）及有效期
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.http_cache')
+EXPIRE_AFTER = 3600
+
+# 出现这些字段说明是错误或限流提示，不缓存
+ERROR_KEYS = ('Error Message', 'Note', 'Information')
+
+
+def cache_enabled(argv=None):
+    """命令行中没有 --no-cache 时启用缓存"""
+    return '--no-cache' not in (argv if argv is not None else sys.argv[1:])
+
+
+def _cacheable(response):
+    """只缓存成功且不是错误/限流提示的响应"""
+    if not response.ok:
+        return False
+    text = response.text
+    return not any(f'"{key}"' in text for key in ERROR_KEYS)
+
+
+def install_http_cache(enabled=True):
+    """
+    为之后创建的所有 requests 会话启用SQLite响应缓存（需要 requests-cache）
+
+    Returns:
+        bool: 是否已启用缓存
+    """
+    if not enabled:
+        return False
+    try:
+        import requests_cache
+    except ImportError:
+        print("提示: 未安装 requests-cache，不使用响应缓存 (pip install requests-cache)")
+        return False
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    requests_cache.install_cache(
+        os.path.join(CACHE_DIR, 'api_cache'),
+        backend='sqlite',
+        expire_after=EXPIRE_AFTER,
+        allowable_methods=('GET',),
+        filter_fn=_cacheable
+    )
+    return True
+
+
+def load_json(key):
+    """读取未过期的缓存JSON，未命中时返回None"""
+    path = os.path.join(CACHE_DIR, f'{key}.json')
+    try:
+        if time.time() - os.path.getmtime(path) >= EXPIRE_AFTER:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_json(key, data):
+    """缓存JSON响应（错误或限流提示不缓存）"""
+    if any(k in data for k in ERROR_KEYS):
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(os.path.join(CACHE_DIR, f'{key}.json'), 'w', encoding='utf-8') as f:
+        json.dump(data, f)
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
 测试 AlphaVantage 数据获取的详细过程
+
+用法:
+    python3 tests/test_alphavantage_direct.py          # 获取单只股票日线数据
+    python3 tests/test_alphavantage_direct.py --bulk   # 另外测试批量报价接口（需要高级版API key）
 """
 
 import sys
@@ -11,6 +15,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from datetime import datetime, timedelta
 from src.data_fetcher_multi import AlphaVantageSource
+from http_cache import cache_enabled, install_http_cache
+
+# 重复运行时使用一小时内的缓存响应（--no-cache 跳过）
+install_http_cache(cache_enabled())
 
 # 测试
 api_key = "JCYHE2IJVOIWUA52"
@@ -45,3 +53,14 @@ if df is not None:
 else:
     print("\n❌ 获取数据失败，返回None")
     print("请查看上面的日志信息")
+
+# 批量报价（需要高级版API key）: 只需最新价格时一次请求获取多只股票
+if '--bulk' in sys.argv:
+    bulk_tickers = ['AAPL', 'MSFT', 'GOOGL', 'TSLA', 'NVDA', 'META', 'AMZN']
+    print(f"\n开始获取批量报价: {', '.join(bulk_tickers)}")
+    quotes = source.fetch_latest_batch(bulk_tickers)
+    if quotes is not None:
+        print(f"\n✅ 一次请求获取了 {len(quotes)} 只股票的最新报价")
+        print(quotes[[c for c in ('ticker', 'timestamp', 'close', 'volume') if c in quotes.columns]])
+    else:
+        print("\n❌ 批量报价获取失败（该接口需要高级版API key）")
@@ -6,13 +6,15 @@
 
 import sys
 import os
+import time
 
 # 添加父目录到路径以便导入src模块
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import logging
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.data_fetcher_multi import MultiSourceDataFetcher
+from http_cache import install_http_cache
 
 # 配置日志
 logging.basicConfig(
@@ -54,26 +56,40 @@ def test_data_source(source_type, api_key=None, test_tickers=['AAPL', 'MSFT', 'G
         print(f"  - 测试股票: {', '.join(test_tickers)}")
         print()
         
-        # 测试获取数据
-        results = {}
-        for ticker in test_tickers:
-            print(f"正在获取 {ticker} 数据...", end=' ')
-            
-            start_time = datetime.now()
+        def timed_fetch(ticker):
+            """获取单只股票数据并计时"""
+            start_ns = time.perf_counter_ns()
             df = fetcher.fetch_single_stock(ticker, period='daily')
-            elapsed = (datetime.now() - start_time).total_seconds()
-            
-            if df is not None and not df.empty:
-                results[ticker] = df
-                print(f"✓ 成功 ({len(df)} 条记录, 耗时 {elapsed:.1f}秒)")
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+            return df, elapsed
+        
+        # 测试获取数据（网络请求并发进行，按完成顺序输出）
+        results = {}
+        print(f"正在获取 {len(test_tickers)} 只股票的数据...")
+        print()
+        max_workers = min(len(test_tickers), fetcher.max_workers * 4)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(timed_fetch, ticker): ticker for ticker in test_tickers}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    df, elapsed = future.result()
+                except Exception as e:
+                    print(f"{ticker}: ✗ 失败 ({e})")
+                    print()
+                    continue
                 
-                # 显示最新数据
-                latest = df.iloc[-1]
-                print(f"  最新数据: 日期={latest['date']}, 收盘价=${latest['close']:.2f}")
-            else:
-                print(f"✗ 失败")
-            
-            print()
+                if df is not None and not df.empty:
+                    results[ticker] = df
+                    print(f"{ticker}: ✓ 成功 ({len(df)} 条记录, 耗时 {elapsed:.1f}秒)")
+                    
+                    # 显示最新数据
+                    # 直接取列数组的最后一个元素，不构造整行Series
+                    print(f"  最新数据: 日期={df['date'].to_numpy()[-1]}, 收盘价=${df['close'].to_numpy()[-1]:.2f}")
+                else:
+                    print(f"{ticker}: ✗ 失败")
+                
+                print()
         
         # 统计
         success_count = len(results)
@@ -131,9 +147,15 @@ def main():
                        nargs='+',
                        default=['AAPL', 'MSFT', 'GOOGL'],
                        help='测试的股票代码列表')
+    parser.add_argument('--no-cache',
+                       action='store_true',
+                       help='不使用响应缓存，直接请求API')
     
     args = parser.parse_args()
     
+    # 重复运行时使用一小时内的缓存响应
+    install_http_cache(not args.no_cache)
+    
     # 检查API key
     if args.source in ['alphavantage', 'polygon'] and not args.api_key:
         print(f"错误: {args.source} 需要提供 API key")
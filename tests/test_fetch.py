@@ -5,12 +5,18 @@
 
 import sys
 import os
+import asyncio
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.data_fetcher import DataFetcher
 from src.data_storage import DataStorage
 import logging
 
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
 # 设置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -23,8 +29,8 @@ def test_fetch():
     # 创建采集器（保守配置）
     fetcher = DataFetcher(
         history_days=180,
-        max_workers=1,      # 串行
-        request_delay=3.0,  # 3秒延迟
+        max_workers=2,      # 最多2个请求同时进行
+        request_delay=3.0,  # 平均3秒一次，即每分钟最多20次请求
         max_retries=2
     )
     
@@ -33,38 +39,49 @@ def test_fetch():
     
     print("=" * 60)
     print(f"测试下载 {len(test_tickers)} 只股票的数据")
-    print("配置: 串行下载，每次间隔3秒，失败重试2次")
+    print("配置: 限速每分钟最多20次请求，最多2个并发，失败重试2次")
     print("=" * 60)
     print()
     
-    # 只下载日K数据
-    data = fetcher.fetch_multiple_stocks(
-        test_tickers,
-        period='daily',
-        batch_size=5  # 小批量
-    )
+    storage = DataStorage()
+    
+    async def fetch_and_save():
+        """每只股票下载完成后立即保存，只保留条数，不在内存中持有全部数据"""
+        counts = {}
+        # 安装了tqdm时用一个进度条显示进度（按完成顺序更新）
+        pbar = tqdm(total=len(test_tickers), unit='只') if tqdm is not None else None
+        async for ticker, df in fetcher.aiter_stocks(test_tickers, period='daily'):
+            if df is not None:
+                storage.save_stock_data(ticker, df, 'daily')
+                counts[ticker] = len(df)
+            if pbar is not None:
+                pbar.set_postfix_str(f"{ticker}:{counts.get(ticker, '失败')}")
+                pbar.update()
+        if pbar is not None:
+            pbar.close()
+        return counts
+    
+    # 只下载日K数据（限速器控制请求频率，不再每次请求后固定等待）
+    counts = asyncio.run(fetch_and_save())
     
     print()
     print("=" * 60)
-    print(f"结果: 成功下载 {len(data)}/{len(test_tickers)} 只股票")
+    print(f"结果: 成功下载 {len(counts)}/{len(test_tickers)} 只股票")
     print("=" * 60)
     
-    if data:
+    if counts:
         print("\n成功的股票:")
-        for ticker, df in data.items():
-            print(f"  ✓ {ticker}: {len(df)} 条数据")
-        
-        # 保存数据
-        storage = DataStorage()
-        storage.save_multiple_stocks(data, 'daily')
+        print("\n".join(f"  ✓ {ticker}: {counts[ticker]} 条数据" for ticker in test_tickers if ticker in counts))
         print(f"\n数据已保存到 data/daily/")
     
-    return len(data) == len(test_tickers)
+    return len(counts) == len(test_tickers)
 
 if __name__ == '__main__':
     print("\n⚠️  注意: 如果刚才触发了限流，建议等待5-10分钟再运行\n")
     
-    input("按Enter键开始测试...")
+    # 只在交互式终端中等待确认，CI或管道运行时直接开始
+    if sys.stdin.isatty() and 'CI' not in os.environ:
+        input("按Enter键开始测试...")
     
     success = test_fetch()
     